@@ -1,9 +1,7 @@
-import shutil
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
-from app.services.repo_ingestor import clone_repo
-from app.services.repo_scanner import scan_repo
-from app.services.code_analyzer import CodeAnalyzer
+from app.services.analysis_cache import analysis_cache, analysis_fingerprint, remember_analysis
 
 router = APIRouter()
 
@@ -11,7 +9,7 @@ class RepoRequest(BaseModel):
     repo_url: str
 
 @router.post("/analyze")
-def analyze_repo(data: RepoRequest):
+async def analyze_repo(data: RepoRequest, response: Response):
     """
     Clone and fully analyze a GitHub repository.
 
@@ -21,26 +19,54 @@ def analyze_repo(data: RepoRequest):
     3. Performs static code analysis
     4. Cleans up cloned repo to save disk space
     5. Returns comprehensive analysis results
+
+    Results are cached by commit SHA, so re-analyzing an unchanged
+    repository skips steps 2 and 3.
     """
+    # Imported lazily so GitPython and the analyzers load on first
+    # request rather than at server startup
+    from app.services.repo_ingestor import clone_repo, get_commit_sha, schedule_cleanup
+    from app.services.repo_scanner import scan_repo
+    from app.services.code_analyzer import analyze_path, get_analyzer_pool
+
     path = None
     try:
         # Clone repository
-        path = clone_repo(data.repo_url)
+        path = await asyncio.to_thread(clone_repo, data.repo_url, shallow=True)
+
+        cache_key = f"analyze:{await asyncio.to_thread(get_commit_sha, path)}"
+        cached = analysis_cache.get(cache_key)
+
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            scan_results, structure_analysis, fingerprint = cached
+        else:
+            response.headers["X-Cache"] = "MISS"
+
+            # Basic scan and detailed code analysis walk the tree
+            # independently, so overlap them; the CPU-bound analysis
+            # runs in the process pool
+            loop = asyncio.get_running_loop()
+            scan_results, structure_analysis = await asyncio.gather(
+                asyncio.to_thread(scan_repo, path),
+                loop.run_in_executor(get_analyzer_pool(), analyze_path, path),
+            )
 
-        # Basic scan
-        scan_results = scan_repo(path)
+            # Hashing the whole analysis is CPU-bound too; keep it off the event loop
+            fingerprint = await asyncio.to_thread(analysis_fingerprint, structure_analysis)
+            analysis_cache.set(cache_key, (scan_results, structure_analysis, fingerprint))
 
-        # Detailed code analysis
-        analyzer = CodeAnalyzer(path)
-        structure_analysis = analyzer.analyze()
+        # Lets /chat and /search trust this fingerprint as a cache key
+        remember_analysis(fingerprint, data.repo_url, structure_analysis)
 
         return {
             "message": "Repository cloned and analyzed successfully",
             "repository_url": data.repo_url,
             "scan_results": scan_results,
-            "structure_analysis": structure_analysis
+            "structure_analysis": structure_analysis,
+            "fingerprint": fingerprint
         }
     finally:
-        # Cleanup: delete cloned repo to save disk space
+        # Cleanup: delete cloned repo to save disk space (in the background)
         if path:
-            shutil.rmtree(path, ignore_errors=True)
+            schedule_cleanup(path)
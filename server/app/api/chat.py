@@ -1,7 +1,10 @@
+import asyncio
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from app.services.chat_service import chat_about_repo
+from app.services.analysis_cache import trusted_analysis
+from app.services.chat_service import chat_about_repo, chat_about_repo_stream
 
 router = APIRouter()
 
@@ -13,26 +16,61 @@ class ChatRequest(BaseModel):
     question: str
     analysis_data: dict
     chat_history: Optional[List[ChatMessage]] = None
+    # Fingerprint returned by /analyze; while the server still holds that
+    # analysis, caches are keyed on it without re-hashing analysis_data
+    fingerprint: Optional[str] = None
+    # Stream the answer as Server-Sent Events instead of one JSON response
+    stream: bool = False
 
 class ChatResponse(BaseModel):
     response: str
 
+def stream_response(events) -> StreamingResponse:
+    """Wrap chat SSE frames in an unbuffered event-stream response."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/chat", response_model=ChatResponse)
-def chat(data: ChatRequest):
+async def chat(data: ChatRequest):
     """
     Chat about an analyzed repository.
 
     Send a question along with the analysis data to get AI-powered insights
-    about the codebase.
+    about the codebase. Set `stream` to receive the answer as Server-Sent
+    Events (same format as /chat/stream).
     """
     history = None
     if data.chat_history:
         history = [{"role": msg.role, "content": msg.content} for msg in data.chat_history]
+    # Re-hashing unrecognized analysis data is CPU-bound; keep it off the event loop
+    analysis_data = await asyncio.to_thread(trusted_analysis, data.analysis_data, data.fingerprint)
 
-    response = chat_about_repo(
+    if data.stream:
+        events = await chat_about_repo_stream(
+            question=data.question,
+            analysis_data=analysis_data,
+            chat_history=history
+        )
+        return stream_response(events)
+
+    response = await chat_about_repo(
         question=data.question,
-        analysis_data=data.analysis_data,
+        analysis_data=analysis_data,
         chat_history=history
     )
 
     return ChatResponse(response=response)
+
+@router.post("/chat/stream")
+async def chat_stream(data: ChatRequest):
+    """
+    Chat about an analyzed repository, streaming the answer.
+
+    Returns Server-Sent Events: `data: {"delta": "..."}` frames as tokens
+    arrive, then `data: [DONE]` once the answer is complete.
+    """
+    data.stream = True
+    return await chat(data)
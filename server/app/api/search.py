@@ -2,12 +2,19 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from app.services.semantic_search import search_with_ai_ranking
+from app.services.analysis_cache import AnalysisCache, trusted_analysis
 
 router = APIRouter()
 
+# Search results keyed by analysis fingerprint and query
+search_cache = AnalysisCache(maxsize=256, ttl=3600)
+
 class SearchRequest(BaseModel):
     query: str
     analysis_data: dict
+    # Fingerprint returned by /analyze; while the server still holds that
+    # analysis, caches are keyed on it without re-hashing analysis_data
+    fingerprint: Optional[str] = None
 
 class SearchResultItem(BaseModel):
     type: str
@@ -30,9 +37,15 @@ def search(data: SearchRequest):
     Search for code elements by concept (e.g., "authentication logic",
     "database queries", "error handling").
     """
-    results = search_with_ai_ranking(
-        query=data.query,
-        analysis_data=data.analysis_data,
-    )
+    analysis_data = trusted_analysis(data.analysis_data, data.fingerprint)
+    cache_key = f"{analysis_data['fingerprint']}\0{data.query}"
+
+    results = search_cache.get(cache_key)
+    if results is None:
+        results = search_with_ai_ranking(
+            query=data.query,
+            analysis_data=analysis_data,
+        )
+        search_cache.set(cache_key, results)
 
     return SearchResponse(**results)
@@ -1,15 +1,41 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from pathlib import Path
-from app.services.code_analyzer import CodeAnalyzer
+from app.services.code_analyzer import CodeAnalyzer, analyze_path, get_analyzer_pool
+from app.services.analysis_cache import analysis_cache, tree_fingerprint
 
 router = APIRouter()
 
+async def analyze_cached(repo_path: str, response: Response) -> dict:
+    """
+    Analyze a repository path, reusing a cached result while no file changed.
+
+    Keyed by resolved path, so both structure endpoints share entries
+    for the same repository.
+    """
+    fingerprint = await asyncio.to_thread(tree_fingerprint, repo_path, CodeAnalyzer.SKIP_DIRS)
+    cache_key = f"structure:{Path(repo_path).resolve()}:{fingerprint}"
+    structure = analysis_cache.get(cache_key)
+
+    if structure is not None:
+        response.headers["X-Cache"] = "HIT"
+    else:
+        response.headers["X-Cache"] = "MISS"
+
+        # Perform analysis
+        loop = asyncio.get_running_loop()
+        structure = await loop.run_in_executor(get_analyzer_pool(), analyze_path, repo_path)
+
+        analysis_cache.set(cache_key, structure)
+
+    return structure
+
 class StructureRequest(BaseModel):
     repo_path: str
 
 @router.post("/structure")
-def get_repository_structure(data: StructureRequest):
+async def get_repository_structure(data: StructureRequest, response: Response):
     """
     Analyze repository structure and return detailed metadata.
 
@@ -29,9 +55,7 @@ def get_repository_structure(data: StructureRequest):
             detail=f"Repository path not found: {repo_path}"
         )
 
-    # Perform analysis
-    analyzer = CodeAnalyzer(repo_path)
-    structure = analyzer.analyze()
+    structure = await analyze_cached(repo_path, response)
 
     return {
         "status": "success",
@@ -40,9 +64,11 @@ def get_repository_structure(data: StructureRequest):
     }
 
 @router.get("/structure/{repo_id}")
-def get_structure_by_id(repo_id: str):
+async def get_structure_by_id(repo_id: str, response: Response):
     """
     Get repository structure by repository ID (from workspace).
+
+    Results are cached until a file in the repository changes.
     """
     repo_path = f"workspace/{repo_id}"
 
@@ -52,9 +78,7 @@ def get_structure_by_id(repo_id: str):
             detail=f"Repository not found: {repo_id}"
         )
 
-    # Perform analysis
-    analyzer = CodeAnalyzer(repo_path)
-    structure = analyzer.analyze()
+    structure = await analyze_cached(repo_path, response)
 
     return {
         "status": "success",
@@ -1,22 +1,34 @@
 from dotenv import load_dotenv
 load_dotenv()  # Load .env file for local development
 
+import os
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.analyze import router as analyze_router
 from app.api.structure import router as structure_router
 from app.api.chat import router as chat_router
 from app.api.search import router as search_router
 
-app = FastAPI(title="CodeExplorer")
+# orjson is much faster on the large nested /analyze and /structure payloads
+app = FastAPI(title="CodeExplorer", default_response_class=ORJSONResponse)
 
 # Configure CORS
+# Comma-separated list of dashboard origins allowed to call the API
+FRONTEND_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("FRONTEND_ORIGIN", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
+    allow_origins=FRONTEND_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Cache"],  # Let the dashboard read cache hits on cross-origin responses
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 app.include_router(analyze_router, prefix="/api")
@@ -0,0 +1,142 @@
+"""
+Analysis Cache Service
+
+Content-addressed, in-process cache for analysis results.
+Keys are derived from what was analyzed (a git commit SHA for cloned
+repositories, or a fingerprint of file mtimes/sizes for local paths),
+so repeat requests for unchanged code skip the scan and AST parse entirely.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+
+# Default time-to-live for cached analyses (seconds)
+DEFAULT_TTL = 86400
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, maxsize: int = 64, ttl: int = DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None):
+        """Store value under key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + (expire if expire is not None else self.ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared cache for /analyze and /structure results
+analysis_cache = AnalysisCache()
+
+# Analyses /analyze issued fingerprints for, by fingerprint. Chat and search
+# caches are shared by every client, so a fingerprint is only trusted as a
+# cache key while the server still holds the content it names
+issued_analyses = AnalysisCache()
+
+
+def analysis_fingerprint(structure_analysis: Any) -> str:
+    """
+    Stable fingerprint of an analysis payload.
+
+    Computed once when analysis completes and returned to the client, so
+    downstream endpoints can key caches on it without re-hashing.
+    """
+    payload = orjson.dumps(
+        structure_analysis,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def remember_analysis(fingerprint: str, repository_url: str, structure_analysis: Any):
+    """Hold an analysis under the fingerprint returned for it to the client."""
+    issued_analyses.set(fingerprint, {
+        "repository_url": repository_url,
+        "structure_analysis": structure_analysis,
+    })
+
+
+def trusted_analysis(analysis_data: Dict[str, Any], fingerprint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    The analysis a chat or search request refers to, with a fingerprint
+    that is safe to key shared caches on.
+
+    A fingerprint the server issued (passed in, or carried in analysis_data)
+    swaps in the analysis held for it. Anything else is fingerprinted here
+    over the whole client payload, which can't collide with an issued
+    fingerprint, so made-up data never lands under a real analysis's key.
+    """
+    fingerprint = fingerprint or analysis_data.get("fingerprint")
+    held = issued_analyses.get(fingerprint) if fingerprint else None
+    if held is not None:
+        return dict(held, fingerprint=fingerprint)
+
+    data = {key: value for key, value in analysis_data.items() if key != "fingerprint"}
+    data["fingerprint"] = analysis_fingerprint(data)
+    return data
+
+
+def tree_fingerprint(repo_path: str, skip_dirs: Iterable[str] = ()) -> str:
+    """
+    Fingerprint a directory tree from its file paths, mtimes and sizes.
+
+    Much cheaper than reading file contents, and changes whenever a file
+    is added, removed, or modified.
+    """
+    skip = set(skip_dirs)
+    entries = []
+
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if d not in skip]
+        for name in files:
+            full_path = os.path.join(root, name)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            rel = os.path.relpath(full_path, repo_path)
+            entries.append(f"{rel}\0{st.st_mtime_ns}\0{st.st_size}")
+
+    entries.sort()
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        digest.update(entry.encode("utf-8", errors="surrogateescape"))
+        digest.update(b"\n")
+    return digest.hexdigest()
@@ -8,9 +8,44 @@ classifies them into architectural layers, and detects relationships.
 
 from typing import Dict, List, Any, Optional, Set
 from pathlib import Path
+from collections import Counter, defaultdict
 import re
 
 
+def _prepare_layer_rules(layer_rules: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Lowercase and index layer rules once so classification is pure membership tests."""
+    prepared = {}
+    for layer_name, rules in layer_rules.items():
+        dirs = sorted(d.lower() for d in rules.get('dirs', ()))
+        prepared[layer_name] = {
+            'dirs_lower': frozenset(dirs),
+            'dir_suffixes': frozenset(d.split('/')[-1] for d in dirs),
+            'dir_needles': tuple('/' + d for d in dirs),
+            'frameworks': frozenset(rules.get('frameworks', ())),
+            'extensions': frozenset(rules.get('extensions', ())),
+        }
+    return prepared
+
+
+class Component:
+    """
+    Aggregated file data for one component (a top-level directory module).
+
+    Slotted since one is built per component and only read back field by field;
+    serialized to a dict node in _build_nodes.
+    """
+
+    __slots__ = ('files', 'languages', 'extensions', 'functions_count', 'classes_count', 'lines')
+
+    def __init__(self):
+        self.files: List[str] = []
+        self.languages: Set[str] = set()
+        self.extensions: Set[str] = set()
+        self.functions_count = 0
+        self.classes_count = 0
+        self.lines = 0
+
+
 class ArchitectureAnalyzer:
     """
     Generates a high-level architecture diagram model from analysis data.
@@ -61,12 +96,18 @@ class ArchitectureAnalyzer:
         },
     }
 
+    _PREPARED_RULES = _prepare_layer_rules(LAYER_RULES)
+
+    FRONTEND_EXTENSIONS = frozenset({'.tsx', '.jsx', '.vue', '.svelte'})
+
     def __init__(self, analysis_data: Dict[str, Any]):
         self.files = analysis_data.get('files', {})
         self.frameworks = analysis_data.get('frameworks', {'frontend': [], 'backend': []})
         self.databases = analysis_data.get('databases', [])
         self.file_dependencies = analysis_data.get('file_dependencies', {})
         self.entry_points = analysis_data.get('entry_points', [])
+        # Inverse index: file path -> component ID (built in _identify_components)
+        self._file_index: Dict[str, str] = {}
 
     def generate(self) -> Dict[str, Any]:
         """Generate the architecture model."""
@@ -94,9 +135,9 @@ class ArchitectureAnalyzer:
             "layers": layer_summary,
         }
 
-    def _identify_components(self) -> Dict[str, Dict]:
+    def _identify_components(self) -> Dict[str, Component]:
         """Group files into logical components based on directory structure."""
-        components: Dict[str, Dict] = {}
+        components: Dict[str, Component] = {}
 
         for file_path, meta in self.files.items():
             normalized = file_path.replace('\\', '/')
@@ -110,27 +151,17 @@ class ArchitectureAnalyzer:
             else:
                 component_id = '(root)'
 
-            if component_id not in components:
-                components[component_id] = {
-                    'files': [],
-                    'languages': set(),
-                    'extensions': set(),
-                    'functions_count': 0,
-                    'classes_count': 0,
-                    'lines': 0,
-                }
-
-            components[component_id]['files'].append(file_path)
-            components[component_id]['languages'].add(meta.get('language', 'Unknown'))
-            components[component_id]['extensions'].add(meta.get('extension', ''))
-            components[component_id]['functions_count'] += len(meta.get('functions', []))
-            components[component_id]['classes_count'] += len(meta.get('classes', []))
-            components[component_id]['lines'] += meta.get('lines', 0)
-
-        # Convert sets to lists for JSON serialization
-        for comp in components.values():
-            comp['languages'] = list(comp['languages'])
-            comp['extensions'] = list(comp['extensions'])
+            comp = components.get(component_id)
+            if comp is None:
+                comp = components[component_id] = Component()
+
+            comp.files.append(file_path)
+            self._file_index[file_path] = component_id
+            comp.languages.add(meta.get('language', 'Unknown'))
+            comp.extensions.add(meta.get('extension', ''))
+            comp.functions_count += len(meta.get('functions', []))
+            comp.classes_count += len(meta.get('classes', []))
+            comp.lines += meta.get('lines', 0)
 
         return components
 
@@ -138,38 +169,43 @@ class ArchitectureAnalyzer:
         """Classify each component into an architectural layer."""
         classification = {}
 
-        all_fw = self.frameworks.get('frontend', []) + self.frameworks.get('backend', [])
+        all_fw = set(self.frameworks.get('frontend', []) + self.frameworks.get('backend', []))
+
+        # Framework association doesn't depend on the component, so resolve it
+        # once: layers whose frameworks are in use -> extensions that earn the bonus
+        framework_exts = {
+            layer_name: rules['extensions']
+            for layer_name, rules in self._PREPARED_RULES.items()
+            if rules['extensions'] and not rules['frameworks'].isdisjoint(all_fw)
+        }
 
         for comp_id, comp_data in components.items():
             comp_lower = comp_id.lower().replace('\\', '/')
+            comp_exts = comp_data.extensions
             layer = 'other'
             best_match_score = 0
 
-            for layer_name, rules in self.LAYER_RULES.items():
+            # The component ID and each of its parent paths, for prefix matching
+            parts = comp_lower.split('/')
+            prefixes = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+            last_part = parts[-1] if len(parts) > 1 else None
+
+            for layer_name, rules in self._PREPARED_RULES.items():
                 score = 0
 
-                # Check directory name match
-                for d in rules.get('dirs', set()):
-                    d_lower = d.lower()
-                    if comp_lower == d_lower or comp_lower.startswith(d_lower + '/'):
-                        score += 10
-                        break
-                    if '/' + d_lower in comp_lower or comp_lower.endswith('/' + d_lower.split('/')[-1]):
-                        score += 5
-                        break
-
-                # Check framework association
-                if any(fw in rules.get('frameworks', set()) for fw in all_fw):
-                    # Check if component contains files with relevant extensions
-                    if 'extensions' in rules:
-                        if any(ext in rules['extensions'] for ext in comp_data.get('extensions', [])):
-                            score += 8
+                # Check directory name match (exact/prefix beats partial)
+                if any(p in rules['dirs_lower'] for p in prefixes):
+                    score += 10
+                elif last_part in rules['dir_suffixes'] or any(n in comp_lower for n in rules['dir_needles']):
+                    score += 5
+
+                # Check framework association via files with relevant extensions
+                if layer_name in framework_exts and not comp_exts.isdisjoint(framework_exts[layer_name]):
+                    score += 8
 
                 # Check if component has frontend-like extensions
-                if layer_name == 'frontend':
-                    frontend_exts = {'.tsx', '.jsx', '.vue', '.svelte'}
-                    if any(ext in frontend_exts for ext in comp_data.get('extensions', [])):
-                        score += 3
+                if layer_name == 'frontend' and not comp_exts.isdisjoint(self.FRONTEND_EXTENSIONS):
+                    score += 3
 
                 if score > best_match_score:
                     best_match_score = score
@@ -181,37 +217,36 @@ class ArchitectureAnalyzer:
 
     def _detect_edges(self, components: Dict) -> List[Dict]:
         """Detect inter-component dependency edges."""
-        edges = []
-        edge_counts: Dict[str, int] = {}  # Track edge weights
+        file_index = self._file_index
+        edge_counts: Counter = Counter()  # Track edge weights
 
         for file_path, deps in self.file_dependencies.items():
-            source_comp = self._file_to_component(file_path, components)
-
-            for resolved_dep in deps.get('resolved', []):
-                target_comp = self._file_to_component(resolved_dep, components)
+            source_comp = file_index.get(file_path)
+            if not source_comp:
+                continue
 
-                if source_comp and target_comp and source_comp != target_comp:
-                    edge_key = f"{source_comp}->{target_comp}"
-                    edge_counts[edge_key] = edge_counts.get(edge_key, 0) + 1
+            edge_counts.update(
+                (source_comp, target_comp)
+                for target_comp in map(file_index.get, deps.get('resolved', ()))
+                if target_comp and target_comp != source_comp
+            )
 
         # Convert to edge list with weights
-        for edge_key, count in edge_counts.items():
-            source, target = edge_key.split('->')
-            edges.append({
+        edges = [
+            {
                 "source": source,
                 "target": target,
                 "label": "imports",
                 "weight": count,
-            })
+            }
+            for (source, target), count in edge_counts.items()
+        ]
 
         return edges
 
     def _file_to_component(self, file_path: str, components: Dict) -> Optional[str]:
         """Map a file path to its component ID."""
-        for comp_id, comp_data in components.items():
-            if file_path in comp_data['files']:
-                return comp_id
-        return None
+        return self._file_index.get(file_path)
 
     def _build_nodes(self, components: Dict, layers: Dict) -> List[Dict]:
         """Build the node list for the architecture diagram."""
@@ -228,11 +263,11 @@ class ArchitectureAnalyzer:
                 "label": label,
                 "type": "component",
                 "layer": layers.get(comp_id, 'other'),
-                "file_count": len(comp_data['files']),
-                "languages": comp_data['languages'],
-                "functions_count": comp_data['functions_count'],
-                "classes_count": comp_data['classes_count'],
-                "lines": comp_data['lines'],
+                "file_count": len(comp_data.files),
+                "languages": list(comp_data.languages),
+                "functions_count": comp_data.functions_count,
+                "classes_count": comp_data.classes_count,
+                "lines": comp_data.lines,
                 "frameworks": [],  # Populated in _label_nodes
             })
 
@@ -281,8 +316,13 @@ class ArchitectureAnalyzer:
         layer_order = ['frontend', 'api', 'middleware', 'services', 'data', 'config', 'utils', 'tests', 'other']
         layers = []
 
+        # Group node IDs by layer in one pass
+        nodes_by_layer = defaultdict(list)
+        for n in nodes:
+            nodes_by_layer[n.get('layer')].append(n['id'])
+
         for layer_name in layer_order:
-            layer_nodes = [n['id'] for n in nodes if n.get('layer') == layer_name]
+            layer_nodes = nodes_by_layer.get(layer_name)
             if layer_nodes:
                 layers.append({
                     "name": layer_name,
@@ -1,97 +1,284 @@
 import os
-from groq import Groq
+import orjson
+import asyncio
+import heapq
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import HTTPException
-from typing import List
-
-def get_groq_client():
+from functools import lru_cache, partial
+from itertools import islice
+from operator import itemgetter
+from typing import AsyncIterator, List, Optional, Tuple
+from app.services.analysis_cache import AnalysisCache, trusted_analysis
+from app.services.relevance import (
+    DEFAULT_INTENT, BM25Index, MentionMatcher, detect_intent, file_document,
+    file_importance, select_window, tokenize,
+)
+from app.services.token_budget import (
+    CHARS_PER_TOKEN, HISTORY_TOKENS, MAX_CONTEXT_TOKENS, MESSAGE_OVERHEAD_TOKENS,
+    count_tokens, get_encoding, token_count_store, truncate_to_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pool settings for the shared client, so requests reuse keep-alive
+# connections instead of paying a TCP+TLS handshake per chat
+GROQ_MAX_KEEPALIVE_CONNECTIONS = 32
+GROQ_MAX_CONNECTIONS = 64
+GROQ_HTTP_TIMEOUT = 30.0
+
+def get_groq_api_key() -> str:
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise HTTPException(
             status_code=500,
             detail="Chat feature is not configured. GROQ_API_KEY is missing."
         )
-    return Groq(api_key=api_key)
+    return api_key
 
-# Maximum context size (in characters) - Groq free tier has 12k TPM limit
-# ~4 chars per token, leaving room for response = ~28k chars max
-MAX_CONTEXT_CHARS = 28000
+@lru_cache(maxsize=1)
+def get_groq_client():
+    """
+    Return the process-wide AsyncGroq client, created on first use.
+
+    The SDK is imported here rather than at module load so workers that
+    never serve chat don't pay for it. A missing API key raises before
+    anything is cached.
+    """
+    import httpx
+    from groq import AsyncGroq
+
+    class ORJSONAsyncGroq(AsyncGroq):
+        """AsyncGroq that serializes request bodies with orjson instead of json."""
+
+        def _build_request(self, options, *, retries_taken: int = 0):
+            # The SDK sends a bytes body as-is; leave anything it has to
+            # merge or encode specially to its own serializer
+            if (isinstance(options.json_data, dict) and options.extra_json is None
+                    and options.files is None and options.content is None):
+                options.json_data = orjson.dumps(options.json_data, default=str)
+            return super()._build_request(options, retries_taken=retries_taken)
+
+    return ORJSONAsyncGroq(
+        api_key=get_groq_api_key(),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=GROQ_MAX_CONNECTIONS,
+            ),
+            timeout=GROQ_HTTP_TIMEOUT,
+        ),
+    )
+
+# Recent answers keyed by (question, analysis fingerprint, recent history),
+# so retries and repeated questions skip the LLM round-trip
+response_cache = AnalysisCache(maxsize=256, ttl=3600)
+
+# BM25 indexes and file-mention matchers, one of each per analysis
+relevance_cache = AnalysisCache(maxsize=32, ttl=3600)
+
+# Rendered chat contexts, keyed by analysis fingerprint and file selection.
+# Call context_cache.clear() to invalidate after re-analysis.
+context_cache = AnalysisCache(maxsize=128, ttl=3600)
+
+# How many question-relevant files to rank ahead of entry points and key files
+MAX_RELEVANT_FILES = 10
+
+# Fallback when the full context overflows the model: files are split into
+# batches answered separately ("map"), then merged into one answer ("reduce")
+MAPREDUCE_MAX_FILES = 12
+MAPREDUCE_MAX_BATCHES = 3
+MAPREDUCE_BATCH_TOKENS = MAX_CONTEXT_TOKENS // 2
+MAPREDUCE_PARTIAL_TOKENS = 1024
+MAPREDUCE_MAP_PROMPT = "Answer only from the files shown; say 'unknown' if not visible."
+MAPREDUCE_REDUCE_PROMPT = "Here are partial analyses; produce the final user-facing answer."
+
+def get_fingerprint(analysis_data: dict) -> str:
+    """
+    Fingerprint of the analysis a chat request refers to.
+
+    The chat API sets it through trusted_analysis; for other callers it is
+    computed the same way, once, and stored on analysis_data, which every
+    cache lookup for the request shares.
+    """
+    fingerprint = analysis_data.get("fingerprint")
+    if not fingerprint:
+        fingerprint = trusted_analysis(analysis_data)["fingerprint"]
+        analysis_data["fingerprint"] = fingerprint
+    return fingerprint
+
+def response_cache_key(question: str, analysis_data: dict, chat_history: list = None) -> str:
+    """
+    Build the response cache key for a chat request.
+
+    Covers exactly the history build_messages puts in the prompt, so two
+    requests share a key only when the model would see the same messages.
+    """
+    fingerprint = get_fingerprint(analysis_data)
+    history = select_history(chat_history, tokenize(question)) if chat_history else []
+    key = f"{question.strip()}\0{fingerprint}\0".encode("utf-8") + orjson.dumps(history)
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
 
 def extract_mentioned_files(question: str, available_files: List[str]) -> List[str]:
     """Extract file names mentioned in the user's question."""
-    mentioned = []
-    question_lower = question.lower()
+    return MentionMatcher(available_files).find(question)
+
+def get_mention_matcher(analysis_data: dict, files: dict) -> MentionMatcher:
+    """Return the file-mention matcher for these files, building it once per analysis."""
+    cache_key = f"mentions:{get_fingerprint(analysis_data)}"
+    matcher = relevance_cache.get(cache_key)
+    if matcher is None:
+        matcher = MentionMatcher(files.keys())
+        relevance_cache.set(cache_key, matcher)
+    return matcher
+
+def get_relevance_index(analysis_data: dict, files: dict) -> BM25Index:
+    """Return the BM25 index for these files, building it once per analysis."""
+    cache_key = f"bm25:{get_fingerprint(analysis_data)}"
+    index = relevance_cache.get(cache_key)
+    if index is None:
+        index = BM25Index({path: file_document(path, info) for path, info in files.items()})
+        relevance_cache.set(cache_key, index)
+    return index
+
+def prioritize_files(files: dict, key_files: List[str], entry_points: List[str], mentioned: List[str], relevant: List[str] = None, max_code_files: int = None, intent: str = DEFAULT_INTENT) -> List[str]:
+    """
+    Prioritize files for inclusion in context.
+
+    Files with code come first; files without any (binary, too large,
+    structure-only analysis) can't be shown, so they trail in the same
+    priority order and only count toward the "more files not shown" note.
+    """
+    priority_order = []
+    no_content = []
+    seen = set()
 
-    for file_path in available_files:
-        file_name = file_path.split('/')[-1].lower()
-        file_stem = file_name.rsplit('.', 1)[0] if '.' in file_name else file_name
+    def take(paths):
+        for f in paths:
+            if f not in seen and f in files:
+                seen.add(f)
+                if files[f].get('content'):
+                    priority_order.append(f)
+                else:
+                    no_content.append(f)
 
-        # Check if file name or stem is mentioned
-        if file_name in question_lower or file_stem in question_lower:
-            mentioned.append(file_path)
-        # Also check for partial path matches
-        elif any(part.lower() in question_lower for part in file_path.split('/')):
-            mentioned.append(file_path)
+    # 1. First add mentioned files (highest priority)
+    take(mentioned)
 
-    return mentioned
+    # 2. Add files ranked relevant to the question
+    take(relevant or [])
 
-def prioritize_files(files: dict, key_files: List[str], entry_points: List[str], mentioned: List[str]) -> List[str]:
-    """Prioritize files for inclusion in context."""
-    priority_order = []
-    seen = set()
+    # 3. Add entry points
+    take(entry_points)
 
-    # 1. First add mentioned files (highest priority)
-    for f in mentioned:
-        if f not in seen and f in files:
-            priority_order.append(f)
-            seen.add(f)
-
-    # 2. Add entry points
-    for f in entry_points:
-        if f not in seen and f in files:
-            priority_order.append(f)
-            seen.add(f)
-
-    # 3. Add key files
-    for f in key_files:
-        if f not in seen and f in files:
-            priority_order.append(f)
-            seen.add(f)
-
-    # 4. Add remaining files sorted by importance (classes + functions count)
+    # 4. Add key files
+    take(key_files)
+
+    # 5. Add remaining files sorted by importance, weighted for the question's intent
     remaining = []
     for path, info in files.items():
-        if path not in seen:
-            score = len(info.get('functions', [])) + len(info.get('classes', [])) * 2
-            remaining.append((path, score))
-
-    remaining.sort(key=lambda x: x[1], reverse=True)
-    for path, _ in remaining:
-        priority_order.append(path)
-
+        if path in seen:
+            continue
+        if info.get('content'):
+            remaining.append((path, file_importance(path, info, intent)))
+        else:
+            no_content.append(path)
+
+    if max_code_files is None:
+        remaining.sort(key=itemgetter(1), reverse=True)
+        priority_order.extend(path for path, _ in remaining)
+    else:
+        # Only the first max_code_files files are ever read, so just pick
+        # the top few; the rest follow unsorted
+        top = heapq.nlargest(max(max_code_files - len(priority_order), 0), remaining, key=itemgetter(1))
+        top_paths = {path for path, _ in top}
+        priority_order.extend(path for path, _ in top)
+        priority_order.extend(path for path, _ in remaining if path not in top_paths)
+
+    priority_order.extend(no_content)
     return priority_order
 
 def build_context(analysis_data: dict, question: str = "", max_code_files: int = 6) -> str:
-    """Build a comprehensive context string including actual code for the LLM."""
+    """
+    Build a comprehensive context string including actual code for the LLM.
+
+    The question only affects which files' code is included, so the rendered
+    context is cached per analysis and file selection; follow-up questions
+    about the same files reuse it.
+    """
+    files = analysis_data.get("structure_analysis", {}).get("files", {})
+
+    # Small repos whose code all fits need no file selection at all
+    if len(files) <= max_code_files:
+        context = render_all_files(analysis_data)
+        if context is not None:
+            return context
+
+    # Determine which files to include with full code
+    mentioned_files = []
+    relevant_files = []
+    question_tokens = tokenize(question)
+    intent = detect_intent(question)
+    if files:
+        mentioned_files = get_mention_matcher(analysis_data, files).find(question)
+        if question_tokens:
+            index = get_relevance_index(analysis_data, files)
+            relevant_files = index.top_n(question_tokens, MAX_RELEVANT_FILES)
+
+    cache_key = "\0".join([
+        get_fingerprint(analysis_data),
+        str(max_code_files),
+        intent,
+        "\n".join(mentioned_files),
+        "\n".join(relevant_files),
+        " ".join(sorted(set(question_tokens))),
+    ])
+    context = context_cache.get(cache_key)
+    if context is None:
+        context = render_context(analysis_data, mentioned_files, relevant_files, max_code_files, question_tokens, intent)
+        context_cache.set(cache_key, context)
+    return context
+
+def build_static_prefix(analysis_data: dict) -> Tuple[str, int]:
+    """
+    Render the question-independent part of the context (overview, README,
+    stack, dependencies, file structure) and its token count.
+
+    Identical for every question about the same analysis, so it is cached
+    per fingerprint.
+    """
+    cache_key = f"prefix:{get_fingerprint(analysis_data)}"
+    cached = context_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     context_parts = []
-    current_size = 0
+    current_tokens = 0
+
+    def add(piece: str):
+        """Append a part, keeping a running token count."""
+        nonlocal current_tokens
+        context_parts.append(piece)
+        current_tokens += count_tokens(piece)
 
     structure = analysis_data.get("structure_analysis", {})
 
     # Repository overview
     repo_url = analysis_data.get("repository_url", "Unknown")
-    context_parts.append(f"# Repository: {repo_url}\n")
+    add(f"# Repository: {repo_url}\n")
 
     # README content (very important for understanding the project)
     readme = structure.get("readme", {})
     if readme and readme.get("content"):
         readme_content = readme["content"][:5000]  # Limit README size
-        context_parts.append(f"## README\n```\n{readme_content}\n```\n")
+        add(f"## README\n```\n{readme_content}\n```\n")
 
     # Languages
     languages = structure.get("languages", {})
     if languages:
         lang_summary = ", ".join([f"{lang} ({info.get('count', 0)} files)" for lang, info in languages.items()])
-        context_parts.append(f"## Languages\n{lang_summary}\n")
+        add(f"## Languages\n{lang_summary}\n")
 
     # Frameworks
     frameworks = structure.get("frameworks", {})
@@ -99,107 +286,225 @@ def build_context(analysis_data: dict, question: str = "", max_code_files: int =
         frontend = frameworks.get("frontend", [])
         backend = frameworks.get("backend", [])
         if frontend:
-            context_parts.append(f"**Frontend:** {', '.join(frontend)}")
+            add(f"**Frontend:** {', '.join(frontend)}")
         if backend:
-            context_parts.append(f"**Backend:** {', '.join(backend)}")
-        context_parts.append("")
+            add(f"**Backend:** {', '.join(backend)}")
+        add("")
 
     # Databases
     databases = structure.get("databases", [])
     if databases:
-        context_parts.append(f"**Databases:** {', '.join(databases)}\n")
-
-    # Entry points
-    entry_points = structure.get("entry_points", [])
-    key_files = structure.get("key_files", [])
+        add(f"**Databases:** {', '.join(databases)}\n")
 
     # Dependencies summary
     dependencies = structure.get("dependencies", {})
     if dependencies:
-        context_parts.append("## Dependencies")
+        add("## Dependencies")
         for dep_type, deps in dependencies.items():
             if isinstance(deps, dict) and deps:
                 for source, dep_list in deps.items():
                     if dep_list:
-                        context_parts.append(f"**{source}:** {', '.join(dep_list[:20])}")
-        context_parts.append("")
+                        add(f"**{source}:** {', '.join(dep_list[:20])}")
+        add("")
 
     # Get all files
     files = structure.get("files", {})
+    if files:
+        # Add file structure overview first (as one part, so it is token-counted once)
+        overview = ["## File Structure Overview"]
+        for file_path, info in islice(files.items(), 50):  # Show up to 50 files
+            functions = info.get("functions", [])
+            classes = info.get("classes", [])
+            summary = []
+            if classes:
+                summary.append(f"classes: {', '.join(classes[:5])}")
+            if functions:
+                summary.append(f"functions: {', '.join(functions[:8])}")
+            if summary:
+                overview.append(f"- **{file_path}**: {'; '.join(summary)}")
+            else:
+                overview.append(f"- {file_path}")
+
+        if len(files) > 50:
+            overview.append(f"- ... and {len(files) - 50} more files")
+        overview.append("")
+        add("\n".join(overview))
+
+        # Source code for prioritized files follows (see render_context)
+        add("## Source Code\n")
+
+    prefix = ("\n".join(context_parts), current_tokens)
+    context_cache.set(cache_key, prefix)
+    return prefix
+
+def render_all_files(analysis_data: dict) -> Optional[str]:
+    """
+    Render the context with every file's code, in file order, or None if
+    that doesn't fit the token budget. Question-independent, so cached
+    per analysis.
+    """
+    cache_key = f"all:{get_fingerprint(analysis_data)}"
+    cached = context_cache.get(cache_key)
+    if cached is not None:
+        return cached or None
+
+    prefix, current_tokens = build_static_prefix(analysis_data)
+    files = analysis_data.get("structure_analysis", {}).get("files", {})
+    context_parts = [prefix]
+    skipped = 0
+
+    for file_path, info in files.items():
+        content = info.get("content", "")
+        if not content:
+            skipped += 1
+            continue
+        file_header = f"### {file_path}\n"
+        file_block = f"```{info.get('language', '').lower().split()[0]}\n{content}\n```\n\n"
+        current_tokens += count_tokens(file_header) + count_tokens(file_block)
+        if current_tokens > MAX_CONTEXT_TOKENS:
+            context_cache.set(cache_key, "")
+            return None
+        context_parts.append(file_header)
+        context_parts.append(file_block)
+
+    if skipped:
+        context_parts.append(f"*({skipped} more files not shown due to context limits)*\n")
+
+    context = "\n".join(context_parts)
+    context_cache.set(cache_key, context)
+    return context
+
+@lru_cache(maxsize=1)
+def get_token_pool() -> ThreadPoolExecutor:
+    """Thread pool for tokenizing; tiktoken releases the GIL while encoding."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="tokens")
+
+def count_tokens_batch(pieces: List[str]) -> List[int]:
+    """
+    Token counts for several pieces of text, encoded in parallel. New
+    counts reach the persistent store in a single commit.
+    """
+    # The character-count fallback is too cheap to be worth a thread hop
+    if len(pieces) < 2 or get_encoding() is None:
+        return [count_tokens(piece) for piece in pieces]
+    pending = []
+    counts = list(get_token_pool().map(partial(count_tokens, pending=pending), pieces))
+    token_count_store.set_many(pending)
+    return counts
+
+def render_context(analysis_data: dict, mentioned_files: List[str], relevant_files: List[str],
+                   max_code_files: int = 6, question_tokens: List[str] = None,
+                   intent: str = DEFAULT_INTENT) -> str:
+    """Render the LLM context for a given selection of files to prioritize."""
+    prefix, current_tokens = build_static_prefix(analysis_data)
+
+    structure = analysis_data.get("structure_analysis", {})
+    files = structure.get("files", {})
     if not files:
-        return "\n".join(context_parts)
+        return prefix
 
-    # Determine which files to include with full code
-    mentioned_files = extract_mentioned_files(question, list(files.keys()))
-    prioritized = prioritize_files(files, key_files, entry_points, mentioned_files)
-
-    # Calculate current context size
-    current_size = sum(len(p) for p in context_parts)
-
-    # Add file structure overview first
-    context_parts.append("## File Structure Overview")
-    for file_path, info in list(files.items())[:50]:  # Show up to 50 files
-        functions = info.get("functions", [])
-        classes = info.get("classes", [])
-        summary = []
-        if classes:
-            summary.append(f"classes: {', '.join(classes[:5])}")
-        if functions:
-            summary.append(f"functions: {', '.join(functions[:8])}")
-        if summary:
-            context_parts.append(f"- **{file_path}**: {'; '.join(summary)}")
-        else:
-            context_parts.append(f"- {file_path}")
+    context_parts = [prefix]
+
+    def add(piece: str, tokens: int = None):
+        """Append a part, keeping a running token count."""
+        nonlocal current_tokens
+        context_parts.append(piece)
+        current_tokens += count_tokens(piece) if tokens is None else tokens
 
-    if len(files) > 50:
-        context_parts.append(f"- ... and {len(files) - 50} more files")
-    context_parts.append("")
+    entry_points = structure.get("entry_points", [])
+    key_files = structure.get("key_files", [])
+    prioritized = prioritize_files(files, key_files, entry_points, mentioned_files, relevant_files, max_code_files, intent)
 
-    # Now include actual source code for prioritized files
-    context_parts.append("## Source Code\n")
+    # Render and tokenize the leading candidates up front (with some
+    # lookahead for files that won't fit), so the fit check below is
+    # plain arithmetic
+    candidates = []
+    for file_path in prioritized:
+        if len(candidates) >= max_code_files * 2:
+            break
+        info = files.get(file_path, {})
+        content = info.get("content", "")
+        if content:
+            candidates.append((
+                file_path,
+                f"### {file_path}\n",
+                f"```{info.get('language', '').lower().split()[0]}\n{content}\n```\n\n",
+            ))
+    token_counts = count_tokens_batch([piece for _, header, block in candidates for piece in (header, block)])
 
     files_included = 0
-    for file_path in prioritized:
+    for i, (file_path, file_header, file_block) in enumerate(candidates):
         if files_included >= max_code_files:
             break
 
         info = files.get(file_path, {})
         content = info.get("content", "")
 
-        if not content:
-            continue
-
         # Check if we have room for this file
-        file_header = f"### {file_path}\n"
-        file_block = f"```{info.get('language', '').lower().split()[0]}\n{content}\n```\n\n"
-
-        new_size = current_size + len(file_header) + len(file_block)
-        if new_size > MAX_CONTEXT_CHARS:
+        header_tokens = token_counts[2 * i]
+        block_tokens = token_counts[2 * i + 1]
+        if current_tokens + header_tokens + block_tokens > MAX_CONTEXT_TOKENS:
             # Try with truncated content
-            max_content = MAX_CONTEXT_CHARS - current_size - len(file_header) - 100
-            if max_content > 500:  # Only include if we can show at least 500 chars
-                truncated = content[:max_content] + "\n... [truncated]"
+            max_content_tokens = MAX_CONTEXT_TOKENS - current_tokens - header_tokens - 25
+            if max_content_tokens > 125:  # Only include if we can show at least ~500 chars
+                # Prefer the part of the file the question is about over its head
+                chars_per_token = len(file_block) / max(block_tokens, 1)
+                truncated = select_window(content, int(max_content_tokens * chars_per_token), question_tokens or [])
+                if truncated is None:
+                    truncated = truncate_to_tokens(content, max_content_tokens) + "\n... [truncated]"
+                elif count_tokens(truncated) > max_content_tokens:
+                    truncated = truncate_to_tokens(truncated, max_content_tokens) + "\n... [truncated]"
                 file_block = f"```{info.get('language', '').lower().split()[0]}\n{truncated}\n```\n\n"
-                context_parts.append(file_header)
-                context_parts.append(file_block)
+                add(file_header, header_tokens)
+                add(file_block)
                 files_included += 1
             break
 
-        context_parts.append(file_header)
-        context_parts.append(file_block)
-        current_size = new_size
+        add(file_header, header_tokens)
+        add(file_block, block_tokens)
         files_included += 1
 
     if files_included < len(prioritized):
         remaining = len(prioritized) - files_included
-        context_parts.append(f"*({remaining} more files not shown due to context limits)*\n")
+        add(f"*({remaining} more files not shown due to context limits)*\n")
 
     return "\n".join(context_parts)
 
-def chat_about_repo(question: str, analysis_data: dict, chat_history: list = None) -> str:
-    """Chat with the LLM about the repository."""
-    client = get_groq_client()
-
+def select_history(chat_history: list, question_tokens: List[str] = None, budget: int = HISTORY_TOKENS) -> list:
+    """
+    Pick the most recent chat messages (up to 10) that fit a token budget.
+
+    Walks newest-first so long old messages (pasted logs, big answers) drop
+    out first. A newest message that is too long on its own is cut down to
+    its part most relevant to the question rather than dropped.
+    """
+    selected = []
+    remaining = budget
+
+    for msg in reversed(chat_history[-10:]):  # Limit to last 10 messages
+        content = msg.get("content", "")
+        tokens = count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+        if tokens > remaining:
+            if selected or remaining <= MESSAGE_OVERHEAD_TOKENS:
+                break
+            content_budget = remaining - MESSAGE_OVERHEAD_TOKENS
+            window = select_window(content, content_budget * CHARS_PER_TOKEN, question_tokens or [])
+            if window is None or count_tokens(window) > content_budget:
+                window = truncate_to_tokens(content, content_budget)
+            content = window
+            tokens = remaining
+
+        selected.append({
+            "role": msg.get("role", "user"),
+            "content": content
+        })
+        remaining -= tokens
+
+    selected.reverse()
+    return selected
+
+def build_messages(question: str, analysis_data: dict, chat_history: list = None) -> list:
+    """Build the LLM message list (system prompt, recent history, question)."""
     # Build context from analysis, including the question for better file prioritization
     context = build_context(analysis_data, question=question)
 
@@ -231,17 +536,176 @@ If a user asks about a specific file that isn't shown in the source code section
 
     # Add chat history if provided
     if chat_history:
-        for msg in chat_history[-10:]:  # Limit to last 10 messages
-            messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", "")
-            })
+        messages.extend(select_history(chat_history, tokenize(question)))
 
     # Add current question
     messages.append({"role": "user", "content": question})
 
+    return messages
+
+def pack_batches(sizes: List[int], budget: int, max_batches: int) -> List[List[int]]:
+    """
+    Pack items into at most max_batches batches of total size <= budget,
+    first-fit-decreasing. Returns item indices per batch, in input order;
+    items that fit nowhere are dropped.
+    """
+    batches: List[List[int]] = []
+    loads: List[int] = []
+    for i in sorted(range(len(sizes)), key=sizes.__getitem__, reverse=True):
+        for b, load in enumerate(loads):
+            if load + sizes[i] <= budget:
+                batches[b].append(i)
+                loads[b] += sizes[i]
+                break
+        else:
+            if len(batches) < max_batches and sizes[i] <= budget:
+                batches.append([i])
+                loads.append(sizes[i])
+    return [sorted(batch) for batch in batches]
+
+def build_batch_messages(question: str, analysis_data: dict) -> List[list]:
+    """
+    Build one map-step message list per batch of prioritized files, for
+    answering a question whose full context is too large for one request.
+    """
+    structure = analysis_data.get("structure_analysis", {})
+    files = structure.get("files", {})
+
+    mentioned_files = []
+    relevant_files = []
+    question_tokens = tokenize(question)
+    if files:
+        mentioned_files = get_mention_matcher(analysis_data, files).find(question)
+        if question_tokens:
+            relevant_files = get_relevance_index(analysis_data, files).top_n(question_tokens, MAX_RELEVANT_FILES)
+    prioritized = prioritize_files(
+        files, structure.get("key_files", []), structure.get("entry_points", []),
+        mentioned_files, relevant_files, MAPREDUCE_MAX_FILES, detect_intent(question),
+    )
+
+    blocks = []
+    for file_path in prioritized:
+        if len(blocks) >= MAPREDUCE_MAX_FILES:
+            break
+        info = files.get(file_path, {})
+        content = info.get("content", "")
+        if content:
+            # A file too big for a batch on its own keeps only its head
+            content = truncate_to_tokens(content, MAPREDUCE_BATCH_TOKENS - 50)
+            blocks.append(f"### {file_path}\n```{info.get('language', '').lower().split()[0]}\n{content}\n```\n")
+
+    header = f"# Repository: {analysis_data.get('repository_url', 'Unknown')}\n\n## Source Code\n"
+    batches = pack_batches(count_tokens_batch(blocks), MAPREDUCE_BATCH_TOKENS, MAPREDUCE_MAX_BATCHES)
+
+    return [
+        [
+            {"role": "system", "content": f"{MAPREDUCE_MAP_PROMPT}\n\n{header}\n" + "\n".join(blocks[i] for i in batch)},
+            {"role": "user", "content": question},
+        ]
+        for batch in batches
+    ]
+
+@lru_cache(maxsize=1)
+def get_chat_error_map() -> list:
+    """Groq SDK exception type -> (status code, user-facing message), checked in order."""
+    from groq import (
+        APIConnectionError, AuthenticationError, InternalServerError,
+        NotFoundError, RateLimitError,
+    )
+
+    return [
+        (RateLimitError, 429, "Rate limit reached. Please wait a moment and try again."),
+        (AuthenticationError, 401, "AI service authentication failed. Please check the API key."),
+        (NotFoundError, 503, "AI model temporarily unavailable. Please try again later."),
+        (APIConnectionError, 503, "AI service is temporarily unavailable. Please try again later."),
+        (InternalServerError, 503, "AI service is temporarily unavailable. Please try again later."),
+    ]
+
+# Groq error codes (from the response body) that need a specific message
+CHAT_ERROR_CODES = {
+    "context_length_exceeded": (400, "The repository is too large to analyze in chat. Try asking about specific files."),
+    "model_not_found": (503, "AI model temporarily unavailable. Please try again later."),
+}
+
+def get_error_code(e: Exception) -> Optional[str]:
+    """Error code reported in a Groq API error body, if any."""
+    body = getattr(e, 'body', None)
+    if isinstance(body, dict):
+        error = body.get('error', body)
+        if isinstance(error, dict):
+            return error.get('code')
+    return None
+
+def is_context_overflow(e: Exception) -> bool:
+    """Whether an LLM client error means the prompt was too large."""
+    return getattr(e, 'status_code', None) == 413 or get_error_code(e) == "context_length_exceeded"
+
+def raise_chat_error(e: Exception):
+    """Translate an LLM client error into a user-facing HTTPException."""
+    error_msg = str(e)
+
+    # Log the actual error for debugging
+    logger.error("Chat API Error: %s", error_msg)
+
+    # Request too large (413) - context exceeds token limit
+    if getattr(e, 'status_code', None) == 413:
+        raise HTTPException(
+            status_code=400,
+            detail="The repository context is too large. Try asking about specific files."
+        )
+
+    code = get_error_code(e)
+    if code in CHAT_ERROR_CODES:
+        status_code, detail = CHAT_ERROR_CODES[code]
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    for exc_type, status_code, detail in get_chat_error_map():
+        if isinstance(e, exc_type):
+            raise HTTPException(status_code=status_code, detail=detail)
+
+    # Generic error - include actual message for debugging
+    raise HTTPException(
+        status_code=500,
+        detail=f"Chat failed: {error_msg[:200]}"
+    )
+
+async def chat_mapreduce(question: str, analysis_data: dict, chat_history: list = None) -> str:
+    """
+    Answer a question whose context overflows the model: ask it against
+    each batch of files concurrently, then merge the partial answers.
+    """
+    client = get_groq_client()
+    batch_messages = await asyncio.to_thread(build_batch_messages, question, analysis_data)
+    if not batch_messages:
+        raise HTTPException(
+            status_code=400,
+            detail="The repository context is too large. Try asking about specific files."
+        )
+
     try:
-        response = client.chat.completions.create(
+        responses = await asyncio.gather(*[
+            client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=messages,
+                temperature=0.3,
+                max_tokens=MAPREDUCE_PARTIAL_TOKENS,
+            )
+            for messages in batch_messages
+        ])
+        partials = [response.choices[0].message.content for response in responses]
+
+        messages = [{"role": "system", "content": MAPREDUCE_REDUCE_PROMPT}]
+        if chat_history:
+            messages.extend(select_history(chat_history, tokenize(question)))
+        messages.append({
+            "role": "user",
+            "content": "\n\n".join(
+                [f"## Partial analysis {i}\n{partial}" for i, partial in enumerate(partials, 1)]
+                + [f"## Question\n{question}"]
+            ),
+        })
+
+        response = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=messages,
             temperature=0.7,
@@ -249,54 +713,96 @@ If a user asks about a specific file that isn't shown in the source code section
         )
         return response.choices[0].message.content
     except Exception as e:
-        error_msg = str(e)
-        error_lower = error_msg.lower()
+        raise_chat_error(e)
 
-        # Log the actual error for debugging
-        print(f"Chat API Error: {error_msg}")
+async def chat_about_repo(question: str, analysis_data: dict, chat_history: list = None) -> str:
+    """Chat with the LLM about the repository."""
+    cache_key = response_cache_key(question, analysis_data, chat_history)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-        # Check for specific Groq error attributes first
-        status_code = getattr(e, 'status_code', None)
+    client = get_groq_client()
+    # Context building is CPU-bound, keep it off the event loop
+    messages = await asyncio.to_thread(build_messages, question, analysis_data, chat_history)
 
-        # Request too large (413) - context exceeds token limit
-        if status_code == 413 or "request too large" in error_lower or "reduce your message size" in error_lower:
-            raise HTTPException(
-                status_code=400,
-                detail="The repository context is too large. Try asking about specific files."
-            )
-        # Rate limit error - too many requests
-        elif status_code == 429 or ("rate_limit" in error_lower and "request too large" not in error_lower):
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit reached. Please wait a moment and try again."
-            )
-        # API key issues
-        elif status_code == 401 or "invalid_api_key" in error_lower or "invalid api key" in error_lower:
-            raise HTTPException(
-                status_code=401,
-                detail="AI service authentication failed. Please check the API key."
-            )
-        # Model not available
-        elif "model_not_found" in error_lower or "model not found" in error_lower or "does not exist" in error_lower:
-            raise HTTPException(
-                status_code=503,
-                detail="AI model temporarily unavailable. Please try again later."
-            )
-        # Context too long - be more specific
-        elif "context_length_exceeded" in error_lower or "maximum context length" in error_lower or "too many tokens" in error_lower:
-            raise HTTPException(
-                status_code=400,
-                detail="The repository is too large to analyze in chat. Try asking about specific files."
-            )
-        # Service unavailable
-        elif status_code == 503 or "service_unavailable" in error_lower or "service unavailable" in error_lower:
-            raise HTTPException(
-                status_code=503,
-                detail="AI service is temporarily unavailable. Please try again later."
-            )
-        # Generic error - include actual message for debugging
-        else:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Chat failed: {error_msg[:200]}"
-            )
+    try:
+        response = await client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=2048,
+        )
+        answer = response.choices[0].message.content
+    except Exception as e:
+        if not is_context_overflow(e):
+            raise_chat_error(e)
+        # Too much context for one request: split it up instead of failing
+        answer = await chat_mapreduce(question, analysis_data, chat_history)
+
+    response_cache.set(cache_key, answer)
+    return answer
+
+def sse_event(payload) -> str:
+    """Format a payload as a Server-Sent Events data frame."""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+async def chat_about_repo_stream(question: str, analysis_data: dict, chat_history: list = None) -> AsyncIterator[str]:
+    """
+    Chat with the LLM about the repository, streaming the answer as SSE frames.
+
+    The completion request is opened before returning, so configuration and
+    API errors still surface as HTTPExceptions rather than mid-stream.
+    """
+    cache_key = response_cache_key(question, analysis_data, chat_history)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        async def replay():
+            yield sse_event({"delta": cached})
+            yield "data: [DONE]\n\n"
+        return replay()
+
+    client = get_groq_client()
+    # Context building is CPU-bound, keep it off the event loop
+    messages = await asyncio.to_thread(build_messages, question, analysis_data, chat_history)
+
+    try:
+        stream = await client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=2048,
+            stream=True,
+        )
+    except Exception as e:
+        if not is_context_overflow(e):
+            raise_chat_error(e)
+        # Too much context for one request: answer via map-reduce and
+        # send it as a single frame
+        answer = await chat_mapreduce(question, analysis_data, chat_history)
+        response_cache.set(cache_key, answer)
+
+        async def replay_mapreduce():
+            yield sse_event({"delta": answer})
+            yield "data: [DONE]\n\n"
+        return replay_mapreduce()
+
+    async def events():
+        parts = []
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield sse_event({"delta": delta})
+        except Exception as e:
+            logger.exception("Chat stream interrupted")
+            yield sse_event({"error": "Chat stream interrupted. Please try again."})
+            return
+
+        # An empty answer is a failed request, not one worth replaying
+        if parts:
+            response_cache.set(cache_key, "".join(parts))
+        yield "data: [DONE]\n\n"
+
+    return events()
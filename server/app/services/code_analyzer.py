@@ -1,9 +1,183 @@
 import os
 import ast
 import re
+import sys
 import json
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
+from app.services.repo_scanner import iter_files
+
+import orjson
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# The toml package's TomlDecodeError is a ValueError too
+TOMLDecodeError = tomllib.TOMLDecodeError if tomllib is not None else ValueError
+
+
+def parse_json(raw: bytes) -> Any:
+    """Parse JSON bytes with orjson, or the more lenient stdlib parser for what it rejects."""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # NaN, huge ints and the like
+        return json.loads(raw.decode('utf-8'))
+
+
+def load_toml(path: Path) -> Dict[str, Any]:
+    """Parse a TOML file with tomllib (or its tomli backport), else the toml package."""
+    if tomllib is None:
+        import toml
+        return toml.load(str(path))
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+def count_lines(content: str) -> int:
+    """
+    Same as len(content.splitlines()) for text with normalized newlines,
+    without building the list of lines.
+    """
+    # splitlines also breaks on these; rare enough to just defer to it
+    if not content.isascii() or '\v' in content or '\f' in content \
+            or '\x1c' in content or '\x1d' in content or '\x1e' in content:
+        return len(content.splitlines())
+    lines = content.count('\n')
+    if content and not content.endswith('\n'):
+        lines += 1
+    return lines
+
+
+@lru_cache(maxsize=4096)
+def parent_parts(file_path: str) -> Tuple[str, ...]:
+    """Directory components of a relative file path (as Path(file_path).parent.parts)."""
+    return tuple(file_path.split(os.sep)[:-1])
+
+
+def strip_suffix(path: str) -> str:
+    """Drop the file extension from a path's last component (as Path.with_suffix(''))."""
+    slash = path.rfind('/')
+    dot = path.rfind('.')
+    if dot > slash + 1 and dot < len(path) - 1:
+        return path[:dot]
+    return path
+
+
+class ImportMap:
+    """
+    Lookup from the names an import might use for a file to the file path.
+
+    A file answers to every trailing run of its path components, with or
+    without its extension ('src/components/Button.tsx', 'components/Button',
+    'Button', ...), an index/__init__ file also to its directory, and any of
+    these with a leading './'. Its full path (or an index file's directory)
+    also answers with a leading '/', and files under src/ to the '@/' alias
+    of their path, with or without extension. Later files win ties, and the
+    '@/' aliases win over everything.
+
+    Only the bare names are stored; the './' and '/' forms are resolved at
+    lookup time rather than stored as extra keys.
+    """
+
+    # Suffixes an import may leave off, in the order resolve() tries them
+    IMPORT_SUFFIXES = (
+        '.ts', '.tsx', '.js', '.jsx', '.py', '.java', '.go',
+        '/index.ts', '/index.tsx', '/index.js', '/index.jsx', '/index.py', '/__init__.py',
+    )
+
+    def __init__(self, file_paths: Iterable[str]):
+        self._names: Dict[str, str] = {}
+        self._rooted: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+
+        file_paths = list(file_paths)
+        names = self._names
+        for file_path in file_paths:
+            normalized = file_path.replace('\\', '/')
+            no_ext = strip_suffix(normalized)
+            slash = normalized.rfind('/')
+            parent = normalized[:slash] if slash > 0 else ''
+            stem = no_ext[slash + 1:]
+
+            # Every trailing run of path components, with and without extension
+            start = 0
+            while True:
+                names[normalized[start:]] = file_path
+                names[no_ext[start:]] = file_path
+                start = normalized.find('/', start) + 1
+                if not start:
+                    break
+
+            self._rooted[no_ext] = file_path
+
+            # For index files, map the directory name
+            if parent and stem in ('index', '__init__'):
+                names[parent] = file_path
+                self._rooted[parent] = file_path
+
+        # Common aliases like @/components -> src/components
+        for file_path in file_paths:
+            normalized = file_path.replace('\\', '/')
+            if normalized.startswith('src/'):
+                alias_path = '@/' + normalized[4:]
+                self._aliases[alias_path] = file_path
+                self._aliases[strip_suffix(alias_path)] = file_path
+
+        # Each name with an import suffix stripped, mapped to what the first
+        # matching suffix probe would return: earlier suffixes win, and at
+        # the same suffix an alias wins over a plain name
+        stems: Dict[str, Tuple[int, str]] = {}
+        for table in (names, self._aliases):
+            for name, file_path in table.items():
+                for rank, suffix in enumerate(self.IMPORT_SUFFIXES):
+                    if name.endswith(suffix):
+                        stem = name[:-len(suffix)]
+                        best = stems.get(stem)
+                        if best is None or rank < best[0] or (rank == best[0] and table is self._aliases):
+                            stems[stem] = (rank, file_path)
+        self._stems: Dict[str, str] = {stem: file_path for stem, (_, file_path) in stems.items()}
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """File path an import name refers to, or default."""
+        resolved = self._aliases.get(name)
+        if resolved is not None:
+            return resolved
+        if name.startswith('./'):
+            return self._names.get(name[2:], default)
+        if name.startswith('/'):
+            return self._rooted.get(name[1:], default)
+        return self._names.get(name, default)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        File path for an import name as written, or with any of
+        IMPORT_SUFFIXES appended (the first that matches wins).
+        """
+        resolved = self.get(name)
+        if resolved:
+            return resolved
+        if name and name != '.' and not name.startswith(('./', '/')):
+            return self._stems.get(name)
+
+        # Prefixed names (and '.', which becomes './' once suffixed) look up
+        # differently; probe one suffix at a time
+        for suffix in self.IMPORT_SUFFIXES:
+            resolved = self.get(name + suffix)
+            if resolved:
+                return resolved
+        return None
 
 
 class CodeAnalyzer:
@@ -17,12 +191,12 @@ class CodeAnalyzer:
     - File structure
     """
 
-    SKIP_DIRS = {
+    SKIP_DIRS = frozenset({
         ".git", "node_modules", "dist", "build", "__pycache__",
         ".venv", "venv", "env", ".next", "out", "coverage",
         ".pytest_cache", ".mypy_cache", "vendor", "target",
         ".idea", ".vscode", "bower_components"
-    }
+    })
 
     # Extension to language name mapping
     LANGUAGE_NAMES = {
@@ -48,17 +222,94 @@ class CodeAnalyzer:
         ".svelte": "Svelte",
     }
 
-    SOURCE_EXTENSIONS = set(LANGUAGE_NAMES.keys())
+    SOURCE_EXTENSIONS = frozenset(LANGUAGE_NAMES)
+    # The same extensions without their dot, for matching rpartition output
+    SOURCE_SUFFIXES = frozenset(ext[1:] for ext in SOURCE_EXTENSIONS)
 
     # Files to completely ignore
-    IGNORE_FILES = {
+    IGNORE_FILES = frozenset({
         'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml',
         'composer.lock', 'gemfile.lock', 'cargo.lock', 'poetry.lock',
         '.ds_store', 'thumbs.db',
+    })
+
+    # AST fields holding statements (or except handlers / match cases that
+    # hold statements), and per node type which of its fields those are
+    STATEMENT_LIST_FIELDS = frozenset({'body', 'handlers', 'orelse', 'finalbody', 'cases'})
+    STATEMENT_FIELDS: Dict[type, tuple] = {}
+
+    # Framework detection: config file names, and packages that identify a
+    # framework on their own (Next.js/React need ordering, so aren't here)
+    NEXT_CONFIG_FILES = frozenset({'next.config.js', 'next.config.ts', 'next.config.mjs'})
+    NUXT_CONFIG_FILES = frozenset({'nuxt.config.js', 'nuxt.config.ts'})
+    FRONTEND_NPM_FRAMEWORKS = {
+        'vue': 'Vue.js',
+        'nuxt': 'Nuxt.js',
+        '@angular/core': 'Angular',
+        'svelte': 'Svelte',
+        '@sveltejs/kit': 'SvelteKit',
+        'vite': 'Vite',
+        'tailwindcss': 'Tailwind CSS',
     }
+    BACKEND_PYTHON_FRAMEWORKS = {
+        'fastapi': 'FastAPI',
+        'flask': 'Flask',
+        'django': 'Django',
+    }
+    BACKEND_NPM_FRAMEWORKS = {
+        'express': 'Express.js',
+        '@nestjs/core': 'NestJS',
+        'nestjs': 'NestJS',
+        'koa': 'Koa',
+        '@hapi/hapi': 'Hapi',
+        'hapi': 'Hapi',
+    }
+
+    # Database client packages. ORMs and query builders (sequelize, typeorm,
+    # prisma, knex, sqlalchemy, django) don't say which database, so aren't
+    # listed; Prisma's schema is checked separately
+    NPM_DATABASES = {
+        'mongoose': 'MongoDB',
+        'mongodb': 'MongoDB',
+        'pg': 'PostgreSQL',
+        'postgres': 'PostgreSQL',
+        'mysql': 'MySQL',
+        'mysql2': 'MySQL',
+        'redis': 'Redis',
+        'ioredis': 'Redis',
+        'sqlite3': 'SQLite',
+        'better-sqlite3': 'SQLite',
+        '@elastic/elasticsearch': 'Elasticsearch',
+        'firebase': 'Firebase',
+        'firebase-admin': 'Firebase',
+        '@supabase/supabase-js': 'Supabase',
+    }
+    PYTHON_DATABASES = {
+        'pymongo': 'MongoDB',
+        'motor': 'MongoDB',  # async MongoDB
+        'psycopg2': 'PostgreSQL',
+        'psycopg2-binary': 'PostgreSQL',
+        'asyncpg': 'PostgreSQL',
+        'pymysql': 'MySQL',
+        'mysqlclient': 'MySQL',
+        'mysql-connector-python': 'MySQL',
+        'redis': 'Redis',
+        'aioredis': 'Redis',
+        'sqlite3': 'SQLite',
+        'aiosqlite': 'SQLite',
+        'elasticsearch': 'Elasticsearch',
+        'firebase-admin': 'Firebase',
+    }
+
+    # Dependency manifests read by _extract_dependencies (requirements names matched lowercased)
+    MANIFEST_FILES = frozenset({'package.json', 'pyproject.toml'})
+    REQUIREMENTS_FILES = frozenset({'requirements.txt', 'requirements-dev.txt', 'requirements.dev.txt'})
+    # Unreadable or malformed manifests are skipped; TypeError and
+    # AttributeError cover valid JSON/TOML with an unexpected shape
+    MANIFEST_ERRORS = (OSError, ValueError, TypeError, AttributeError, TOMLDecodeError)
 
     # Entry point patterns
-    ENTRY_BASENAMES = {
+    ENTRY_BASENAMES = frozenset({
         'main', 'app', 'index', 'application', 'server', 'client',
         'program', 'startup', 'bootstrap', 'init', 'run', 'start',
         'launcher', 'entry', 'root', 'core', 'mod', 'lib',
@@ -66,26 +317,91 @@ class CodeAnalyzer:
         'app.module', 'app.component', 'app-routing.module',
         'manage', 'wsgi', 'asgi', 'settings', 'urls', 'views', 'models',
         'api', 'routes', 'router',
-    }
-
-    def __init__(self, repo_path: str):
+    })
+
+    # Below this many source files, process start-up costs more than parallel parsing saves
+    PARALLEL_MIN_FILES = 50
+    # Files per task sent to a worker: enough to amortize the IPC round-trip,
+    # small enough to balance load
+    PARALLEL_CHUNK_SIZE = 32
+
+    # Regexes for the per-file extractors, compiled once rather than looked
+    # up in re's pattern cache for every file
+    JS_IMPORT_FROM_PATTERN = re.compile(r"import\s+.*?\s+from\s+['\"]([^'\"]+)['\"]", re.DOTALL)
+    JS_IMPORT_SIDE_EFFECT_PATTERN = re.compile(r"import\s+['\"]([^'\"]+)['\"]")
+    JS_REQUIRE_PATTERN = re.compile(r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)")
+    JS_DYNAMIC_IMPORT_PATTERN = re.compile(r"import\s*\(\s*['\"]([^'\"]+)['\"]\s*\)")
+    JS_REEXPORT_PATTERN = re.compile(r"export\s+.*?\s+from\s+['\"]([^'\"]+)['\"]")
+    JS_IMPORT_KEYWORD = re.compile(r"import\s")
+    JS_EXPORT_KEYWORD = re.compile(r"export\s")
+    JS_FROM_CLAUSE_PATTERN = re.compile(r"\s+from\s+['\"]([^'\"]+)['\"]")
+    WHITESPACE_PATTERN = re.compile(r"\s*")
+    JS_FUNCTION_PATTERN = re.compile(r"(?:function|const|let|var)\s+(\w+)\s*(?:=\s*(?:async\s*)?\(|=\s*function|\()")
+    CLASS_PATTERN = re.compile(r"class\s+(\w+)")
+    JAVA_IMPORT_PATTERN = re.compile(r"import\s+([\w.]+);")
+    JAVA_METHOD_PATTERN = re.compile(r"(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+\w+\s*)?{")
+    GO_IMPORT_PATTERN = re.compile(r'import\s+(?:\(\s*)?["\']([^"\']+)["\']')
+    GO_FUNC_PATTERN = re.compile(r"func\s+(?:\([^)]+\)\s+)?(\w+)")
+    REQUIREMENT_NAME_SPLIT = re.compile(r'[=<>!~\[]')
+    REQUIREMENT_NAME_PATTERN = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+    GO_MOD_REQUIRE_PATTERN = re.compile(r'^\s*([\w./-]+)\s+v', re.MULTILINE)
+    CARGO_KEY_PATTERN = re.compile(r'^\s*([a-zA-Z0-9_-]+)\s*=', re.MULTILINE)
+
+    # Call graph: function/method boundaries per language, and call sites
+    JS_FUNCTION_BOUNDARY_PATTERN = re.compile(
+        r'(?:function\s+(\w+)\s*\([^)]*\)\s*\{|'        # function foo() {
+        r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|'  # const foo = () =>
+        r'(?:const|let|var)\s+(\w+)\s*=\s*function\s*\(|'  # const foo = function(
+        r'(\w+)\s*\([^)]*\)\s*\{)',                         # method() { in class
+        re.MULTILINE
+    )
+    JAVA_METHOD_BOUNDARY_PATTERN = re.compile(
+        r'(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+\s*)?\{',
+        re.MULTILINE
+    )
+    GO_FUNCTION_BOUNDARY_PATTERN = re.compile(r'func\s+(?:\([^)]+\)\s+)?(\w+)\s*\([^)]*\)\s*(?:\([^)]*\)\s*)?\{', re.MULTILINE)
+    CALL_PATTERN = re.compile(r'\b(\w+)\s*\(')
+
+    def __init__(self, repo_path: str, parallel: bool = True):
         self.repo_path = Path(repo_path)
+        # Whether large repos fan file parsing out to a process pool; off
+        # when the analyzer already runs inside one
+        self.parallel = parallel
         self.files: Dict[str, Dict] = {}
         self.all_imports: List[str] = []
         self.all_npm_deps: Set[str] = set()
         self.all_python_deps: Set[str] = set()
         # Temporary storage for full file contents (used for call graph, cleared after)
         self._file_contents: Dict[str, str] = {}
+        # Per-function call names gathered while parsing Python files, so the
+        # call graph doesn't need to parse them a second time (cleared after)
+        self._python_calls: Dict[str, List[tuple]] = {}
+        # Filled by _scan_repo: (directory, filename) of dependency manifests
+        # in walk order, and every lowercased file name seen
+        self._manifests: List[tuple] = []
+        self._config_files: Set[str] = set()
+        # Config file texts read by _read_config (lowercased; None if missing)
+        self._config_text: Dict[str, Optional[str]] = {}
+        # Root package.json as parsed by _extract_dependencies or
+        # _load_package_json (None until loaded or if missing/invalid)
+        self._package_json: Optional[Any] = None
+        self._package_json_loaded = False
+        # Names directly under the repo root, listed on first use by _in_root
+        self._root_names: Optional[frozenset] = None
 
     def analyze(self) -> Dict[str, Any]:
         """Main analysis entry point."""
-        # Collect and analyze source files
-        for file_path in self._get_source_files():
-            meta = self._analyze_file(file_path)
-            if meta:
-                rel = str(file_path.relative_to(self.repo_path))
-                self.files[rel] = meta
-                self.all_imports.extend(meta.get('imports', []))
+        # Collect source files, manifests and config file names in one walk
+        source_files = self._scan_repo()
+        workers = os.cpu_count() or 1
+
+        if self.parallel and len(source_files) >= self.PARALLEL_MIN_FILES and workers > 1:
+            self._analyze_files_parallel(source_files, workers)
+        else:
+            for file_path, raw in read_ahead(source_files):
+                meta = self._analyze_file(file_path, raw)
+                if meta:
+                    self._record_file(str(file_path.relative_to(self.repo_path)), meta)
 
         # Extract all dependencies first (needed for framework detection)
         dependencies = self._extract_dependencies()
@@ -108,6 +424,9 @@ class CodeAnalyzer:
 
         # Clear temporary content storage to free memory
         self._file_contents.clear()
+        self._python_calls.clear()
+        # Split directory parts are only reused within one repo's resolution
+        parent_parts.cache_clear()
 
         # Build architecture model
         from app.services.architecture_service import ArchitectureAnalyzer
@@ -120,8 +439,10 @@ class CodeAnalyzer:
         }
         architecture = ArchitectureAnalyzer(arch_data).generate()
 
+        languages, complexity = self._file_stats()
+
         return {
-            "languages": self._language_stats(),
+            "languages": languages,
             "frameworks": frameworks,
             "databases": databases,
             "dependencies": dependencies,
@@ -129,7 +450,7 @@ class CodeAnalyzer:
             "key_files": self._key_files(),
             "tree": self._build_file_tree(),
             "total_files": len(self.files),
-            "complexity": self._complexity(),
+            "complexity": complexity,
             "files": self.files,
             "file_dependencies": file_dependencies,
             "call_graph": call_graph,
@@ -139,39 +460,98 @@ class CodeAnalyzer:
             "run_scripts": self._extract_run_scripts(),
         }
 
-    def _get_source_files(self) -> List[Path]:
-        """Get all source files, excluding ignored directories and files."""
+    def _scan_repo(self) -> List[Path]:
+        """
+        Walk the repo once, returning all source files (excluding ignored
+        directories and files) and recording dependency manifests and
+        config file names for _extract_dependencies and _detect_frameworks.
+        """
         result = []
-        for root, dirs, files in os.walk(self.repo_path):
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-            for name in files:
-                if name.lower() in self.IGNORE_FILES:
-                    continue
-                ext = Path(name).suffix.lower()
-                if ext in self.SOURCE_EXTENSIONS:
-                    result.append(Path(root) / name)
+        manifests = self._manifests
+        config_files = self._config_files
+        for entry in iter_files(self.repo_path, self.SKIP_DIRS):
+            name = entry.name
+            name_lower = name.lower()
+            config_files.add(name_lower)
+            if name in self.MANIFEST_FILES or name_lower in self.REQUIREMENTS_FILES:
+                manifests.append((os.path.dirname(entry.path), name))
+            if name_lower in self.IGNORE_FILES:
+                continue
+            # Split the already-lowercased name; like splitext, a name that
+            # is only leading dots before its last dot has no extension
+            stem, _, ext = name_lower.rpartition('.')
+            if ext in self.SOURCE_SUFFIXES and stem.lstrip('.'):
+                result.append(Path(entry.path))
 
         return result
 
+    def _analyze_files_parallel(self, source_files: List[Path], workers: int):
+        """
+        Parse files across worker processes in small chunks, merging in order.
+
+        Chunks are handed out as workers free up, so a few huge files don't
+        leave the other workers idle the way one chunk per worker did.
+        """
+        chunk_size = self.PARALLEL_CHUNK_SIZE
+        chunks = [
+            [str(p) for p in source_files[i:i + chunk_size]]
+            for i in range(0, len(source_files), chunk_size)
+        ]
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for results in pool.map(_parse_chunk, [str(self.repo_path)] * len(chunks), chunks):
+                for rel, meta, content, calls in results:
+                    self._record_file(rel, meta)
+                    if content:
+                        self._file_contents[rel] = content
+                    if calls is not None:
+                        self._python_calls[rel] = calls
+
+    def _record_file(self, rel: str, meta: Dict):
+        """
+        Add a parsed file's metadata. Import strings are interned, since the
+        same module names recur across files (and come back from worker
+        processes as fresh copies).
+        """
+        imports = meta.get('imports')
+        if imports:
+            imports[:] = map(sys.intern, imports)
+            self.all_imports.extend(imports)
+        self.files[rel] = meta
+
     # Maximum content size to store (in characters) - ~2000 tokens worth
     MAX_CONTENT_SIZE = 8000
 
-    def _analyze_file(self, path: Path) -> Optional[Dict]:
-        """Analyze a single source file."""
+    # Extension -> name of the method that extracts imports/functions/classes
+    ANALYZERS = {
+        '.py': '_analyze_python',
+        '.js': '_analyze_js',
+        '.jsx': '_analyze_js',
+        '.ts': '_analyze_js',
+        '.tsx': '_analyze_js',
+        '.java': '_analyze_java',
+        '.go': '_analyze_go',
+    }
+
+    def _analyze_file(self, path: Path, raw: Optional[bytes] = None) -> Optional[Dict]:
+        """Analyze a single source file, optionally from already-read bytes."""
         try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
+            # Read bytes so the size comes from the read rather than an
+            # extra stat call; newlines are translated as read_text would
+            if raw is None:
+                raw = path.read_bytes()
+            content = raw.decode("utf-8", errors="ignore")
+            if "\r" in content:
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
             ext = path.suffix.lower()
 
-            # Store full content for call graph extraction (will be cleared after analysis)
             rel = str(path.relative_to(self.repo_path))
-            self._file_contents[rel] = content
 
             meta = {
                 "extension": ext,
                 "language": self.LANGUAGE_NAMES.get(ext, "Unknown"),
-                "lines": len(content.splitlines()),
-                "size": path.stat().st_size,
+                "lines": count_lines(content),
+                "size": len(raw),
                 "imports": [],
                 "functions": [],
                 "classes": [],
@@ -181,14 +561,18 @@ class CodeAnalyzer:
                 "content_truncated": len(content) > self.MAX_CONTENT_SIZE
             }
 
-            if ext == ".py":
-                meta.update(self._analyze_python(content))
-            elif ext in {".js", ".jsx", ".ts", ".tsx"}:
-                meta.update(self._analyze_js(content))
-            elif ext == ".java":
-                meta.update(self._analyze_java(content))
-            elif ext == ".go":
-                meta.update(self._analyze_go(content))
+            analyzer = self.ANALYZERS.get(ext)
+            if analyzer is not None:
+                analysis = getattr(self, analyzer)(content)
+                # Only the Python analyzer extracts calls for the call graph
+                calls = analysis.pop("function_calls", None)
+                if calls is not None:
+                    self._python_calls[rel] = calls
+                elif analysis["functions"]:
+                    # Keep full content for call graph extraction (released as
+                    # it is consumed); files without functions have no callers
+                    self._file_contents[rel] = content
+                meta.update(analysis)
 
             return meta
         except Exception:
@@ -198,84 +582,171 @@ class CodeAnalyzer:
         """Analyze Python file."""
         try:
             tree = ast.parse(content)
-            imports, funcs, classes = [], [], []
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    imports.extend(a.name for a in node.names)
-                elif isinstance(node, ast.ImportFrom) and node.module:
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # Invalid source, null bytes, or nesting too deep for the parser
+            return {"imports": [], "functions": [], "classes": [], "has_main": False, "function_calls": []}
+
+        imports, funcs, classes = [], [], []
+        function_calls = []
+
+        # Imports, functions and classes are statements, so walk only
+        # statement lists (breadth-first, in ast.walk's order) and skip
+        # the expression subtrees that make up most of the tree
+        queue = deque([tree])
+        while queue:
+            node = queue.popleft()
+            node_type = type(node)
+            if node_type is ast.Import:
+                imports.extend(a.name for a in node.names)
+            elif node_type is ast.ImportFrom:
+                if node.module:
                     imports.append(node.module)
-                elif isinstance(node, ast.FunctionDef):
-                    funcs.append(node.name)
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-
-            return {
-                "imports": imports,
-                "functions": funcs,
-                "classes": classes,
-                "has_main": "__main__" in content or "def main" in content
-            }
-        except:
-            return {"imports": [], "functions": [], "classes": [], "has_main": False}
+            elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+                funcs.append(node.name)
+                # Names called anywhere in the function body, for the call graph
+                calls = [self._extract_call_name(child) for child in ast.walk(node)
+                         if isinstance(child, ast.Call)]
+                function_calls.append((node.name, [c for c in calls if c]))
+            elif node_type is ast.ClassDef:
+                classes.append(node.name)
+
+            fields = self.STATEMENT_FIELDS.get(node_type)
+            if fields is None:
+                fields = tuple(f for f in node_type._fields if f in self.STATEMENT_LIST_FIELDS)
+                self.STATEMENT_FIELDS[node_type] = fields
+            for field in fields:
+                queue.extend(getattr(node, field))
+
+        return {
+            "imports": imports,
+            "functions": funcs,
+            "classes": classes,
+            "has_main": "__main__" in content or "def main" in content,
+            "function_calls": function_calls,
+        }
 
     def _analyze_js(self, content: str) -> Dict:
         """Analyze JavaScript/TypeScript file with comprehensive import detection."""
         imports = set()
 
-        # Standard ES6 imports: import X from 'module'
-        imports.update(re.findall(r"import\s+.*?\s+from\s+['\"]([^'\"]+)['\"]", content, re.DOTALL))
+        # Each pattern starts with a literal keyword; a substring check is far
+        # cheaper than a regex scan, so patterns whose keyword is absent are skipped
+        if 'import' in content:
+            # Standard ES6 imports: import X from 'module'
+            # (also covers TypeScript type imports: import type { X } from 'module')
+            imports.update(self._find_from_clauses(content, self.JS_IMPORT_KEYWORD, self.JS_IMPORT_FROM_PATTERN, False))
 
-        # Import only: import 'module' (side effects)
-        imports.update(re.findall(r"import\s+['\"]([^'\"]+)['\"]", content))
+            # Import only: import 'module' (side effects)
+            imports.update(self.JS_IMPORT_SIDE_EFFECT_PATTERN.findall(content))
 
-        # Require statements: require('module')
-        imports.update(re.findall(r"require\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", content))
+            # Dynamic imports: import('module')
+            imports.update(self.JS_DYNAMIC_IMPORT_PATTERN.findall(content))
 
-        # Dynamic imports: import('module')
-        imports.update(re.findall(r"import\s*\(\s*['\"]([^'\"]+)['\"]\s*\)", content))
+        # Require statements: require('module')
+        if 'require' in content:
+            imports.update(self.JS_REQUIRE_PATTERN.findall(content))
 
         # Re-exports: export * from 'module' or export { x } from 'module'
-        imports.update(re.findall(r"export\s+.*?\s+from\s+['\"]([^'\"]+)['\"]", content))
-
-        # Type imports (TypeScript): import type { X } from 'module'
-        imports.update(re.findall(r"import\s+type\s+.*?\s+from\s+['\"]([^'\"]+)['\"]", content))
+        if 'export' in content:
+            imports.update(self._find_from_clauses(content, self.JS_EXPORT_KEYWORD, self.JS_REEXPORT_PATTERN, True))
 
         return {
             "imports": list(imports),
-            "functions": re.findall(r"(?:function|const|let|var)\s+(\w+)\s*(?:=\s*(?:async\s*)?\(|=\s*function|\()", content),
-            "classes": re.findall(r"class\s+(\w+)", content),
+            "functions": self.JS_FUNCTION_PATTERN.findall(content),
+            "classes": self.CLASS_PATTERN.findall(content) if 'class' in content else [],
             "has_main": "createRoot" in content or "ReactDOM.render" in content or "createApp" in content
         }
 
+    def _find_from_clauses(self, content: str, keyword: re.Pattern, pattern: re.Pattern, single_line: bool) -> List[str]:
+        """
+        Same result as pattern.findall(content) for a `<keyword> ... from 'module'`
+        pattern, without its quadratic worst case.
+
+        findall retries the lazy `.*?` at every keyword, and from a keyword
+        with no from-clause after it (or, for single-line patterns, before
+        the end of its line) that retry scans to the end of the text, which
+        on minified bundles means once per keyword. Here the next
+        from-clause is located once and reused until passed, so keywords
+        that can't match are skipped without rescanning.
+        """
+        found = []
+        clause = None
+        pos = 0
+        while True:
+            kw = keyword.search(content, pos)
+            if kw is None:
+                break
+            start, body = kw.start(), kw.end()
+
+            # Leftmost from-clause the pattern could end on
+            if clause is None or clause.start() < body:
+                clause = self.JS_FROM_CLAUSE_PATTERN.search(content, body)
+                if clause is None:
+                    break
+
+            if single_line:
+                body_start = self.WHITESPACE_PATTERN.match(content, body).end()
+                if clause.start() >= body_start and content.find('\n', body_start, clause.start()) != -1:
+                    pos = start + 1
+                    continue
+
+            match = pattern.match(content, start)
+            if match:
+                found.append(match.group(1))
+                pos = match.end()
+            else:
+                pos = start + 1
+
+        return found
+
     def _analyze_java(self, content: str) -> Dict:
         """Analyze Java file."""
         return {
-            "imports": re.findall(r"import\s+([\w.]+);", content),
-            "functions": re.findall(r"(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+\w+\s*)?{", content),
-            "classes": re.findall(r"class\s+(\w+)", content),
+            "imports": self.JAVA_IMPORT_PATTERN.findall(content),
+            "functions": self.JAVA_METHOD_PATTERN.findall(content),
+            "classes": self.CLASS_PATTERN.findall(content),
             "has_main": "public static void main" in content
         }
 
     def _analyze_go(self, content: str) -> Dict:
         """Analyze Go file."""
         return {
-            "imports": re.findall(r'import\s+(?:\(\s*)?["\']([^"\']+)["\']', content),
-            "functions": re.findall(r"func\s+(?:\([^)]+\)\s+)?(\w+)", content),
+            "imports": self.GO_IMPORT_PATTERN.findall(content),
+            "functions": self.GO_FUNC_PATTERN.findall(content),
             "classes": [],  # Go doesn't have classes
             "has_main": "func main()" in content
         }
 
     def _language_stats(self) -> Dict[str, Dict]:
         """Calculate language statistics with proper names."""
+        return self._file_stats()[0]
+
+    def _file_stats(self) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+        """
+        Language statistics and complexity metrics, aggregated in a single
+        pass over the file metadata.
+        """
         stats = {}
+        total_lines = total_functions = total_classes = 0
         for meta in self.files.values():
+            lines = meta.get("lines", 0)
             lang = meta.get("language", "Unknown")
-            if lang not in stats:
-                stats[lang] = {"count": 0, "lines": 0}
-            stats[lang]["count"] += 1
-            stats[lang]["lines"] += meta.get("lines", 0)
-        return stats
+            lang_stats = stats.get(lang)
+            if lang_stats is None:
+                lang_stats = stats[lang] = {"count": 0, "lines": 0}
+            lang_stats["count"] += 1
+            lang_stats["lines"] += lines
+            total_lines += lines
+            total_functions += len(meta.get("functions", []))
+            total_classes += len(meta.get("classes", []))
+
+        complexity = {
+            "files": len(self.files),
+            "lines": total_lines,
+            "functions": total_functions,
+            "classes": total_classes,
+        }
+        return stats, complexity
 
     def _extract_dependencies(self) -> Dict[str, Dict[str, List[str]]]:
         """Extract dependencies from ALL config files in the repo."""
@@ -285,96 +756,111 @@ class CodeAnalyzer:
             "other": {}
         }
 
-        # Find all package.json files (for monorepos)
-        for root, dirs, files in os.walk(self.repo_path):
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
+        # Manifests found by _scan_repo (all package.json files, for monorepos)
+        for root, filename in self._manifests:
             rel_root = Path(root).relative_to(self.repo_path)
+            file_path = Path(root) / filename
 
-            for filename in files:
-                file_path = Path(root) / filename
-
-                # JavaScript - package.json
-                if filename == 'package.json':
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            pkg = json.load(f)
-                            prefix = str(rel_root) if str(rel_root) != '.' else ''
+            # JavaScript - package.json
+            if filename == 'package.json':
+                try:
+                    pkg = parse_json(file_path.read_bytes())
+                    prefix = str(rel_root) if str(rel_root) != '.' else ''
+                    if not prefix:
+                        # Reused by _detect_package_manager and _extract_run_scripts
+                        self._package_json = pkg
+                        self._package_json_loaded = True
+
+                    if pkg.get('dependencies'):
+                        key = f"{prefix}/dependencies" if prefix else "dependencies"
+                        dependencies["javascript"][key] = list(pkg['dependencies'].keys())
+                    if pkg.get('devDependencies'):
+                        key = f"{prefix}/devDependencies" if prefix else "devDependencies"
+                        dependencies["javascript"][key] = list(pkg['devDependencies'].keys())
+                except self.MANIFEST_ERRORS:
+                    pass
 
-                            if pkg.get('dependencies'):
-                                key = f"{prefix}/dependencies" if prefix else "dependencies"
-                                dependencies["javascript"][key] = list(pkg['dependencies'].keys())
-                            if pkg.get('devDependencies'):
-                                key = f"{prefix}/devDependencies" if prefix else "devDependencies"
-                                dependencies["javascript"][key] = list(pkg['devDependencies'].keys())
-                    except:
-                        pass
-
-                # Python - requirements.txt
-                if filename.lower() in ['requirements.txt', 'requirements-dev.txt', 'requirements.dev.txt']:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            deps = []
-                            for line in f:
-                                line = line.strip()
-                                if line and not line.startswith('#') and not line.startswith('-'):
-                                    pkg = re.split(r'[=<>!~\[]', line)[0].strip()
-                                    if pkg:
-                                        deps.append(pkg)
-                            if deps:
-                                prefix = str(rel_root) if str(rel_root) != '.' else ''
-                                key = f"{prefix}/{filename}" if prefix else filename
-                                dependencies["python"][key] = deps
-                    except:
-                        pass
-
-                # Python - pyproject.toml
-                if filename == 'pyproject.toml':
-                    try:
-                        content = file_path.read_text()
-                        # Look for dependencies in [project.dependencies] or [tool.poetry.dependencies]
+            # Python - requirements.txt
+            if filename.lower() in self.REQUIREMENTS_FILES:
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
                         deps = []
-                        in_deps_section = False
-                        for line in content.split('\n'):
-                            if '[project.dependencies]' in line or '[tool.poetry.dependencies]' in line:
-                                in_deps_section = True
-                                continue
-                            if in_deps_section:
-                                if line.startswith('['):
-                                    break
-                                match = re.match(r'^([a-zA-Z0-9_-]+)\s*=', line.strip())
-                                if match:
-                                    deps.append(match.group(1))
+                        for line in f:
+                            line = line.strip()
+                            if line and not line.startswith('#') and not line.startswith('-'):
+                                pkg = self.REQUIREMENT_NAME_SPLIT.split(line, 1)[0].strip()
+                                if pkg:
+                                    deps.append(pkg)
                         if deps:
                             prefix = str(rel_root) if str(rel_root) != '.' else ''
-                            key = f"{prefix}/pyproject.toml" if prefix else "pyproject.toml"
+                            key = f"{prefix}/{filename}" if prefix else filename
                             dependencies["python"][key] = deps
-                    except:
-                        pass
+                except self.MANIFEST_ERRORS:
+                    pass
+
+            # Python - pyproject.toml
+            if filename == 'pyproject.toml':
+                try:
+                    pyproject = load_toml(file_path)
+                    # PEP 621 [project] dependencies are requirement strings;
+                    # [tool.poetry.dependencies] maps names to constraints
+                    deps = []
+                    for section in (pyproject.get('project', {}), pyproject.get('tool', {}).get('poetry', {})):
+                        section_deps = section.get('dependencies') or []
+                        if isinstance(section_deps, dict):
+                            names = list(section_deps)
+                        else:
+                            names = [m.group(1) for m in map(self.REQUIREMENT_NAME_PATTERN.match, section_deps) if m]
+                        deps.extend(name for name in names if name not in deps)
+                    if deps:
+                        prefix = str(rel_root) if str(rel_root) != '.' else ''
+                        key = f"{prefix}/pyproject.toml" if prefix else "pyproject.toml"
+                        dependencies["python"][key] = deps
+                except self.MANIFEST_ERRORS:
+                    pass
 
         # Go - go.mod (root only)
         go_mod_path = self.repo_path / "go.mod"
-        if go_mod_path.exists():
+        if self._in_root("go.mod"):
             try:
                 content = go_mod_path.read_text()
-                deps = re.findall(r'^\s*([\w./-]+)\s+v', content, re.MULTILINE)
+                deps = self.GO_MOD_REQUIRE_PATTERN.findall(content)
                 if deps:
                     dependencies["other"]["go.mod"] = deps
-            except:
+            except self.MANIFEST_ERRORS:
                 pass
 
         # Rust - Cargo.toml (root only)
         cargo_path = self.repo_path / "Cargo.toml"
-        if cargo_path.exists():
+        if self._in_root("Cargo.toml"):
             try:
                 content = cargo_path.read_text()
-                deps = re.findall(r'^\s*([a-zA-Z0-9_-]+)\s*=', content, re.MULTILINE)
+                deps = self.CARGO_KEY_PATTERN.findall(content)
                 if deps:
                     dependencies["other"]["Cargo.toml"] = [d for d in deps if d not in ['name', 'version', 'edition', 'authors']]
-            except:
+            except self.MANIFEST_ERRORS:
                 pass
 
         return dependencies
 
+    def _read_config(self, rel_path: str) -> Optional[str]:
+        """
+        Lowercased text of a config file under the repo root, or None if it
+        is missing or unreadable. Read at most once per analysis, however
+        many detectors look at it.
+        """
+        if rel_path not in self._config_text:
+            # Root-level names were all seen by _scan_repo, so a miss there
+            # needs no stat call
+            if '/' not in rel_path and rel_path.lower() not in self._config_files:
+                self._config_text[rel_path] = None
+            else:
+                try:
+                    self._config_text[rel_path] = (self.repo_path / rel_path).read_text().lower()
+                except Exception:
+                    self._config_text[rel_path] = None
+        return self._config_text[rel_path]
+
     def _detect_frameworks(self) -> Dict[str, List[str]]:
         """Detect frontend and backend frameworks."""
         frontend = []
@@ -383,66 +869,34 @@ class CodeAnalyzer:
         npm_deps = self.all_npm_deps
         python_deps = self.all_python_deps
 
-        # Check for config files in entire repo
-        config_files = set()
-        for _, dirs, files in os.walk(self.repo_path):
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-            for f in files:
-                config_files.add(f.lower())
+        # Config file names from anywhere in the repo (collected by _scan_repo)
+        config_files = self._config_files
 
         # ===== Frontend frameworks =====
 
         # Next.js
-        if 'next.config.js' in config_files or 'next.config.ts' in config_files or 'next.config.mjs' in config_files or 'next' in npm_deps:
+        if not config_files.isdisjoint(self.NEXT_CONFIG_FILES) or 'next' in npm_deps:
             frontend.append('Next.js')
         # React (but not if Next.js already detected)
         elif 'react' in npm_deps or 'react-dom' in npm_deps:
             frontend.append('React')
 
-        # Vue.js
-        if 'vue' in npm_deps:
-            frontend.append('Vue.js')
         # Nuxt.js
-        if 'nuxt' in npm_deps or 'nuxt.config.js' in config_files or 'nuxt.config.ts' in config_files:
+        if not config_files.isdisjoint(self.NUXT_CONFIG_FILES):
             frontend.append('Nuxt.js')
 
-        # Angular
-        if '@angular/core' in npm_deps:
-            frontend.append('Angular')
-
-        # Svelte
-        if 'svelte' in npm_deps:
-            frontend.append('Svelte')
-        if '@sveltejs/kit' in npm_deps:
-            frontend.append('SvelteKit')
-
-        # Build tools
-        if 'vite' in npm_deps:
-            frontend.append('Vite')
-
-        # CSS frameworks
-        if 'tailwindcss' in npm_deps:
-            frontend.append('Tailwind CSS')
+        # Vue.js, Nuxt.js, Angular, Svelte, build tools, CSS frameworks
+        frontend.extend(self.FRONTEND_NPM_FRAMEWORKS[dep] for dep in npm_deps.intersection(self.FRONTEND_NPM_FRAMEWORKS))
 
         # ===== Backend frameworks =====
 
         # Python backends
-        if 'fastapi' in python_deps:
-            backend.append('FastAPI')
-        if 'flask' in python_deps:
-            backend.append('Flask')
-        if 'django' in python_deps or 'manage.py' in config_files:
+        backend.extend(self.BACKEND_PYTHON_FRAMEWORKS[dep] for dep in python_deps.intersection(self.BACKEND_PYTHON_FRAMEWORKS))
+        if 'manage.py' in config_files:
             backend.append('Django')
 
         # Node.js backends
-        if 'express' in npm_deps:
-            backend.append('Express.js')
-        if '@nestjs/core' in npm_deps or 'nestjs' in npm_deps:
-            backend.append('NestJS')
-        if 'koa' in npm_deps:
-            backend.append('Koa')
-        if '@hapi/hapi' in npm_deps or 'hapi' in npm_deps:
-            backend.append('Hapi')
+        backend.extend(self.BACKEND_NPM_FRAMEWORKS[dep] for dep in npm_deps.intersection(self.BACKEND_NPM_FRAMEWORKS))
 
         # Java - Spring Boot (check for specific Spring files/imports)
         if any('springframework' in imp for imp in self.all_imports):
@@ -450,15 +904,10 @@ class CodeAnalyzer:
         elif 'pom.xml' in config_files or 'build.gradle' in config_files:
             # Check if pom.xml or build.gradle contains spring
             for cfg in ['pom.xml', 'build.gradle']:
-                cfg_path = self.repo_path / cfg
-                if cfg_path.exists():
-                    try:
-                        content = cfg_path.read_text().lower()
-                        if 'spring-boot' in content or 'springframework' in content:
-                            backend.append('Spring Boot')
-                            break
-                    except:
-                        pass
+                content = self._read_config(cfg)
+                if content is not None and ('spring-boot' in content or 'springframework' in content):
+                    backend.append('Spring Boot')
+                    break
 
         # Go frameworks - only detect if we actually have Go files
         has_go_files = any(meta.get('language') == 'Go' for meta in self.files.values())
@@ -474,25 +923,15 @@ class CodeAnalyzer:
 
         # Ruby on Rails
         if 'gemfile' in config_files:
-            gemfile_path = self.repo_path / "Gemfile"
-            if gemfile_path.exists():
-                try:
-                    content = gemfile_path.read_text().lower()
-                    if 'rails' in content:
-                        backend.append('Ruby on Rails')
-                except:
-                    pass
+            content = self._read_config("Gemfile")
+            if content is not None and 'rails' in content:
+                backend.append('Ruby on Rails')
 
         # PHP - Laravel
         if 'artisan' in config_files or 'composer.json' in config_files:
-            composer_path = self.repo_path / "composer.json"
-            if composer_path.exists():
-                try:
-                    content = composer_path.read_text().lower()
-                    if 'laravel' in content:
-                        backend.append('Laravel')
-                except:
-                    pass
+            content = self._read_config("composer.json")
+            if content is not None and 'laravel' in content:
+                backend.append('Laravel')
 
         return {
             "frontend": list(set(frontend)),
@@ -506,106 +945,47 @@ class CodeAnalyzer:
         npm_deps = self.all_npm_deps
         python_deps = self.all_python_deps
 
-        # Check npm dependencies for database packages
-        npm_db_mapping = {
-            'mongoose': 'MongoDB',
-            'mongodb': 'MongoDB',
-            'pg': 'PostgreSQL',
-            'postgres': 'PostgreSQL',
-            'mysql': 'MySQL',
-            'mysql2': 'MySQL',
-            'redis': 'Redis',
-            'ioredis': 'Redis',
-            'sqlite3': 'SQLite',
-            'better-sqlite3': 'SQLite',
-            'sequelize': None,  # ORM, check connection
-            'typeorm': None,  # ORM, check connection
-            'prisma': None,  # ORM, check schema
-            '@prisma/client': None,
-            'knex': None,  # Query builder
-            '@elastic/elasticsearch': 'Elasticsearch',
-            'firebase': 'Firebase',
-            'firebase-admin': 'Firebase',
-            '@supabase/supabase-js': 'Supabase',
-        }
-
-        for dep, db in npm_db_mapping.items():
-            if dep in npm_deps and db:
-                databases.add(db)
-
-        # Check Python dependencies for database packages
-        python_db_mapping = {
-            'pymongo': 'MongoDB',
-            'motor': 'MongoDB',  # async MongoDB
-            'psycopg2': 'PostgreSQL',
-            'psycopg2-binary': 'PostgreSQL',
-            'asyncpg': 'PostgreSQL',
-            'pymysql': 'MySQL',
-            'mysqlclient': 'MySQL',
-            'mysql-connector-python': 'MySQL',
-            'redis': 'Redis',
-            'aioredis': 'Redis',
-            'sqlite3': 'SQLite',
-            'aiosqlite': 'SQLite',
-            'sqlalchemy': None,  # ORM
-            'django': None,  # Check settings
-            'elasticsearch': 'Elasticsearch',
-            'firebase-admin': 'Firebase',
-        }
-
-        for dep, db in python_db_mapping.items():
-            if dep in python_deps and db:
-                databases.add(db)
+        # Check npm and Python dependencies for database packages
+        databases.update(self.NPM_DATABASES[dep] for dep in npm_deps.intersection(self.NPM_DATABASES))
+        databases.update(self.PYTHON_DATABASES[dep] for dep in python_deps.intersection(self.PYTHON_DATABASES))
 
         # Check Prisma schema for database type
-        prisma_schema = self.repo_path / "prisma" / "schema.prisma"
-        if prisma_schema.exists():
-            try:
-                content = prisma_schema.read_text().lower()
-                if 'postgresql' in content or 'postgres' in content:
-                    databases.add('PostgreSQL')
-                elif 'mysql' in content:
-                    databases.add('MySQL')
-                elif 'mongodb' in content:
-                    databases.add('MongoDB')
-                elif 'sqlite' in content:
-                    databases.add('SQLite')
-            except:
-                pass
+        content = self._read_config("prisma/schema.prisma")
+        if content is not None:
+            if 'postgresql' in content or 'postgres' in content:
+                databases.add('PostgreSQL')
+            elif 'mysql' in content:
+                databases.add('MySQL')
+            elif 'mongodb' in content:
+                databases.add('MongoDB')
+            elif 'sqlite' in content:
+                databases.add('SQLite')
 
         # Check docker-compose for database services
         for compose_file in ['docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml']:
-            compose_path = self.repo_path / compose_file
-            if compose_path.exists():
-                try:
-                    content = compose_path.read_text().lower()
-                    if 'postgres' in content:
-                        databases.add('PostgreSQL')
-                    if 'mysql' in content or 'mariadb' in content:
-                        databases.add('MySQL')
-                    if 'mongo' in content:
-                        databases.add('MongoDB')
-                    if 'redis' in content:
-                        databases.add('Redis')
-                except:
-                    pass
+            content = self._read_config(compose_file)
+            if content is not None:
+                if 'postgres' in content:
+                    databases.add('PostgreSQL')
+                if 'mysql' in content or 'mariadb' in content:
+                    databases.add('MySQL')
+                if 'mongo' in content:
+                    databases.add('MongoDB')
+                if 'redis' in content:
+                    databases.add('Redis')
 
         # Check .env files for database URLs
         for env_file in ['.env', '.env.example', '.env.local', '.env.development']:
-            env_path = self.repo_path / env_file
-            if env_path.exists():
-                try:
-                    content = env_path.read_text().lower()
-                    if 'mongodb' in content or 'mongo_uri' in content:
-                        databases.add('MongoDB')
-                    if 'postgres' in content or 'postgresql' in content:
-                        databases.add('PostgreSQL')
-                    if 'mysql' in content:
-                        databases.add('MySQL')
-                    if 'redis' in content:
-                        databases.add('Redis')
-                except:
-                    pass
+            content = self._read_config(env_file)
+            if content is not None:
+                if 'mongodb' in content or 'mongo_uri' in content:
+                    databases.add('MongoDB')
+                if 'postgres' in content or 'postgresql' in content:
+                    databases.add('PostgreSQL')
+                if 'mysql' in content:
+                    databases.add('MySQL')
+                if 'redis' in content:
+                    databases.add('Redis')
 
         return list(databases)
 
@@ -664,34 +1044,31 @@ class CodeAnalyzer:
         tree = {}
 
         for file_path, meta in self.files.items():
-            parts = Path(file_path).parts
+            # Keys are relative paths built by str(Path), so split on os.sep
+            *dirs, name = file_path.split(os.sep)
             current = tree
 
-            for i, part in enumerate(parts):
-                if i == len(parts) - 1:  # File
-                    current[part] = {
-                        'type': 'file',
-                        'size': meta.get('size', 0),
-                        'language': meta.get('language', 'Unknown'),
-                        'lines': meta.get('lines', 0)
-                    }
-                else:  # Directory
-                    if part not in current:
-                        current[part] = {'type': 'folder', 'children': {}}
-                    elif 'children' not in current[part]:
-                        current[part] = {'type': 'folder', 'children': {}}
-                    current = current[part]['children']
+            for part in dirs:
+                node = current.get(part)
+                if node is None or 'children' not in node:
+                    node = current[part] = {'type': 'folder', 'children': {}}
+                current = node['children']
+
+            current[name] = {
+                'type': 'file',
+                'size': meta.get('size', 0),
+                'language': meta.get('language', 'Unknown'),
+                'lines': meta.get('lines', 0)
+            }
 
         return tree
 
     def _complexity(self) -> Dict[str, int]:
         """Calculate overall complexity metrics."""
-        return {
-            "files": len(self.files),
-            "lines": sum(m.get("lines", 0) for m in self.files.values()),
-            "functions": sum(len(m.get("functions", [])) for m in self.files.values()),
-            "classes": sum(len(m.get("classes", [])) for m in self.files.values()),
-        }
+        return self._file_stats()[1]
+
+    # './' and '../' in either separator style (as _resolve_import normalizes them)
+    RELATIVE_IMPORT_PREFIXES = ('./', '../', '.\\', '..\\')
 
     def _build_file_dependencies(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -703,91 +1080,47 @@ class CodeAnalyzer:
         # Create a map of possible module names to file paths
         file_map = self._build_file_map()
 
+        # The same import strings recur across files; only relative ones
+        # depend on the importing file, and then only on its directory
+        resolve_cache: Dict[tuple, Optional[str]] = {}
+        resolve_import = self._resolve_import
+        relative_prefixes = self.RELATIVE_IMPORT_PREFIXES
+
         for file_path, meta in self.files.items():
             imports = meta.get('imports', [])
-            deps = {
-                'imports': imports,  # Raw import strings
-                'resolved': [],      # Resolved to actual files in repo
-                'external': [],      # External packages (not in repo)
-            }
+            # Insertion-ordered dicts dedupe without rescanning the lists
+            resolved_files: Dict[str, None] = {}
+            external: Dict[str, None] = {}
 
+            file_dir = os.path.dirname(file_path)
             for imp in imports:
-                resolved = self._resolve_import(imp, file_path, file_map)
+                key = (imp, file_dir if imp.startswith(relative_prefixes) else None)
+                if key in resolve_cache:
+                    resolved = resolve_cache[key]
+                else:
+                    resolved = resolve_cache[key] = resolve_import(imp, file_path, file_map)
                 if resolved:
-                    if resolved not in deps['resolved']:
-                        deps['resolved'].append(resolved)
+                    resolved_files[resolved] = None
                 else:
                     # It's an external package
-                    if imp not in deps['external']:
-                        deps['external'].append(imp)
+                    external[imp] = None
 
-            file_deps[file_path] = deps
+            file_deps[file_path] = {
+                'imports': imports,                # Raw import strings
+                'resolved': list(resolved_files),  # Resolved to actual files in repo
+                'external': list(external),        # External packages (not in repo)
+            }
 
         return file_deps
 
-    def _build_file_map(self) -> Dict[str, str]:
+    def _build_file_map(self) -> "ImportMap":
         """
         Build a map from possible import names to actual file paths.
         E.g., 'components/Button' -> 'src/components/Button.tsx'
         """
-        file_map = {}
-
-        for file_path in self.files.keys():
-            # Normalize path separators
-            normalized = file_path.replace('\\', '/')
-
-            # Get various forms of the path that could be used in imports
-            path_obj = Path(normalized)
-            stem = path_obj.stem  # filename without extension
-            parent = str(path_obj.parent).replace('\\', '/') if str(path_obj.parent) != '.' else ''
-
-            # Full path without extension
-            no_ext = str(path_obj.with_suffix('')).replace('\\', '/')
-            file_map[no_ext] = file_path
-            file_map['./' + no_ext] = file_path
-            file_map['/' + no_ext] = file_path
-
-            # Full path WITH extension (some imports include extension)
-            file_map[normalized] = file_path
-            file_map['./' + normalized] = file_path
-
-            # Just the filename (for relative imports)
-            file_map[stem] = file_path
-            file_map['./' + stem] = file_path
+        return ImportMap(self.files.keys())
 
-            # For index files, map the directory name
-            if stem in ['index', '__init__']:
-                if parent:
-                    file_map[parent] = file_path
-                    file_map['./' + parent] = file_path
-                    file_map['/' + parent] = file_path
-
-            # Handle various path formats
-            # src/components/Button -> components/Button, Button
-            parts = normalized.split('/')
-            for i in range(len(parts)):
-                partial = '/'.join(parts[i:])
-                partial_no_ext = str(Path(partial).with_suffix('')).replace('\\', '/')
-                file_map[partial_no_ext] = file_path
-                file_map['./' + partial_no_ext] = file_path
-
-                # Also with extension
-                file_map[partial] = file_path
-                file_map['./' + partial] = file_path
-
-        # Also track common alias paths (src/, @/, etc.)
-        for file_path in self.files.keys():
-            normalized = file_path.replace('\\', '/')
-            # Common aliases like @/components -> src/components
-            if normalized.startswith('src/'):
-                alias_path = '@/' + normalized[4:]
-                alias_no_ext = str(Path(alias_path).with_suffix('')).replace('\\', '/')
-                file_map[alias_path] = file_path
-                file_map[alias_no_ext] = file_path
-
-        return file_map
-
-    def _resolve_import(self, imp: str, current_file: str, file_map: Dict[str, str]) -> Optional[str]:
+    def _resolve_import(self, imp: str, current_file: str, file_map: "ImportMap") -> Optional[str]:
         """
         Try to resolve an import string to an actual file in the repository.
         Returns the file path if found, None if it's an external package.
@@ -796,11 +1129,11 @@ class CodeAnalyzer:
         if imp.startswith('@') and '/' in imp:
             # Scoped npm packages like @types/node, @nestjs/common
             return None
-        if not imp.startswith('.') and not imp.startswith('/'):
-            # Check if it looks like a node module (no path separators at start)
-            # These are likely external: 'react', 'express', 'lodash'
-            # But could be aliased paths: 'components/Button'
-            pass
+        if '/' not in imp and '\\' not in imp and not imp.startswith('.'):
+            # Bare names: packages like 'react', 'express', 'lodash' (usually
+            # external), but also Python modules and files named directly,
+            # so they still go through the map; there is no path to clean up
+            return file_map.resolve(imp)
 
         # Clean up the import
         clean_imp = imp.replace('\\', '/')
@@ -808,117 +1141,155 @@ class CodeAnalyzer:
         # Remove leading ./ or /
         if clean_imp.startswith('./'):
             # Relative import - resolve from current file's directory
-            current_dir = str(Path(current_file).parent).replace('\\', '/')
-            if current_dir == '.':
-                clean_imp = clean_imp[2:]
-            else:
-                clean_imp = current_dir + '/' + clean_imp[2:]
+            current_dir = parent_parts(current_file)
+            clean_imp = clean_imp[2:]
+            if current_dir:
+                clean_imp = '/'.join(current_dir) + '/' + clean_imp
         elif clean_imp.startswith('../'):
-            # Parent directory import
-            current_dir = Path(current_file).parent
-            while clean_imp.startswith('../'):
-                current_dir = current_dir.parent
-                clean_imp = clean_imp[3:]
-            if str(current_dir) != '.':
-                clean_imp = str(current_dir).replace('\\', '/') + '/' + clean_imp
+            # Parent directory import (going above the repo root stays at the root)
+            current_dir = parent_parts(current_file)
+            # Count the leading ../ steps, then cut both sides once
+            ups = 1
+            while clean_imp.startswith('../', 3 * ups):
+                ups += 1
+            clean_imp = clean_imp[3 * ups:]
+            current_dir = current_dir[:max(len(current_dir) - ups, 0)]
+            if current_dir:
+                clean_imp = '/'.join(current_dir) + '/' + clean_imp
         elif clean_imp.startswith('/'):
             clean_imp = clean_imp[1:]
 
-        # Try to find in file map
-        if clean_imp in file_map:
-            return file_map[clean_imp]
-
-        # Try with common extensions
-        for ext in ['', '.ts', '.tsx', '.js', '.jsx', '.py', '.java', '.go']:
-            test_path = clean_imp + ext
-            if test_path in file_map:
-                return file_map[test_path]
-
-        # Try index files
-        for idx in ['/index.ts', '/index.tsx', '/index.js', '/index.jsx', '/index.py', '/__init__.py']:
-            test_path = clean_imp + idx
-            if test_path in file_map:
-                return file_map[test_path]
+        # Try to find in file map, as written or with a common extension
+        # or index file appended
+        resolved = file_map.resolve(clean_imp)
+        if resolved:
+            return resolved
 
         # Direct lookup in file map
         return file_map.get(imp)
 
+    # Root files checked, in priority order, by _extract_readme,
+    # _detect_package_manager and _extract_run_scripts
+    README_FILES = ('README.md', 'readme.md', 'README', 'readme.txt', 'README.rst')
+    README_PATTERNS_LOWER = ('readme.md', 'readme', 'readme.txt', 'readme.rst')
+    LOCK_FILES = (
+        ('pnpm-lock.yaml', 'pnpm'),
+        ('yarn.lock', 'yarn'),
+        ('bun.lockb', 'bun'),
+        ('package-lock.json', 'npm'),
+    )
+    IMPORTANT_SCRIPTS = ('start', 'dev', 'serve', 'build', 'test', 'lint')
+    # README characters kept in the analysis
+    README_PREVIEW_CHARS = 5000
+
+    def _root_listing(self) -> frozenset:
+        """Names directly under the repo root, listed once per analysis."""
+        if self._root_names is None:
+            try:
+                with os.scandir(self.repo_path) as it:
+                    self._root_names = frozenset(entry.name for entry in it)
+            except OSError:
+                self._root_names = frozenset()
+        return self._root_names
+
+    def _in_root(self, name: str) -> bool:
+        """Whether the repo root has an entry called name, from a single listing."""
+        return name in self._root_listing()
+
     def _extract_readme(self) -> Optional[Dict[str, str]]:
         """Extract README content if exists."""
-        readme_patterns = ['README.md', 'readme.md', 'README', 'readme.txt', 'README.rst']
-
-        for pattern in readme_patterns:
-            readme_path = self.repo_path / pattern
-            if readme_path.exists():
-                try:
-                    content = readme_path.read_text(encoding='utf-8', errors='ignore')
-                    return {
-                        'file': pattern,
-                        'content': content[:5000],
-                        'full_length': len(content)
-                    }
-                except:
-                    continue
+        root_names = self._root_listing()
+        candidates = [name for name in self.README_FILES if name in root_names]
+        if not candidates:
+            # Other casings (Readme.md, README.MD, ...), in the same priority
+            by_lower: Dict[str, str] = {}
+            for name in sorted(root_names):
+                by_lower.setdefault(name.lower(), name)
+            candidates = [by_lower[pattern] for pattern in self.README_PATTERNS_LOWER if pattern in by_lower]
+
+        # Enough bytes for the preview however wide its characters are
+        read_limit = self.README_PREVIEW_CHARS * 4
+        for name in candidates:
+            readme_path = self.repo_path / name
+            try:
+                with open(readme_path, 'rb') as f:
+                    head = f.read(read_limit + 1)
+                    size = os.fstat(f.fileno()).st_size
+                content = head.decode('utf-8', errors='ignore')
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                return {
+                    'file': name,
+                    'content': content[:self.README_PREVIEW_CHARS],
+                    # Exact for READMEs read whole; long ones report their size in bytes
+                    'full_length': len(content) if len(head) <= read_limit else size
+                }
+            except OSError:
+                continue
 
         return None
 
+    def _load_package_json(self) -> Optional[Any]:
+        """Parsed root package.json, read at most once per analysis (None if missing or invalid)."""
+        if not self._package_json_loaded:
+            self._package_json_loaded = True
+            if self._in_root('package.json'):
+                try:
+                    self._package_json = parse_json((self.repo_path / 'package.json').read_bytes())
+                except (OSError, ValueError):
+                    # Unreadable or invalid JSON (orjson and json errors are ValueErrors)
+                    self._package_json = None
+        return self._package_json
+
     def _detect_package_manager(self) -> Optional[str]:
         """Detect the package manager used in the project."""
         # Check for lock files (most reliable indicator)
-        lock_files = {
-            'pnpm-lock.yaml': 'pnpm',
-            'yarn.lock': 'yarn',
-            'bun.lockb': 'bun',
-            'package-lock.json': 'npm',
-        }
-
-        for lock_file, manager in lock_files.items():
-            if (self.repo_path / lock_file).exists():
+        for lock_file, manager in self.LOCK_FILES:
+            if self._in_root(lock_file):
                 return manager
 
         # Check if package.json has packageManager field
-        pkg_json_path = self.repo_path / 'package.json'
-        if pkg_json_path.exists():
+        has_pkg_json = self._in_root('package.json')
+        pkg = self._load_package_json()
+        if pkg is not None:
             try:
-                with open(pkg_json_path, 'r', encoding='utf-8') as f:
-                    pkg = json.load(f)
-                    if 'packageManager' in pkg:
-                        pm = pkg['packageManager']
-                        if 'pnpm' in pm:
-                            return 'pnpm'
-                        elif 'yarn' in pm:
-                            return 'yarn'
-                        elif 'bun' in pm:
-                            return 'bun'
-                        elif 'npm' in pm:
-                            return 'npm'
-            except:
+                if 'packageManager' in pkg:
+                    pm = pkg['packageManager']
+                    if 'pnpm' in pm:
+                        return 'pnpm'
+                    elif 'yarn' in pm:
+                        return 'yarn'
+                    elif 'bun' in pm:
+                        return 'bun'
+                    elif 'npm' in pm:
+                        return 'npm'
+            except TypeError:
+                # Not an object, or packageManager isn't a string
                 pass
 
         # Default to npm if package.json exists
-        if pkg_json_path.exists():
+        if has_pkg_json:
             return 'npm'
 
         return None
 
     def _extract_run_scripts(self) -> Optional[Dict[str, str]]:
         """Extract scripts from package.json."""
-        pkg_json_path = self.repo_path / 'package.json'
-        if not pkg_json_path.exists():
+        pkg = self._load_package_json()
+        if pkg is None:
             return None
 
         try:
-            with open(pkg_json_path, 'r', encoding='utf-8') as f:
-                pkg = json.load(f)
-                scripts = pkg.get('scripts', {})
-                if scripts:
-                    # Return important scripts
-                    important_scripts = {}
-                    for key in ['start', 'dev', 'serve', 'build', 'test', 'lint']:
-                        if key in scripts:
-                            important_scripts[key] = scripts[key]
-                    return important_scripts if important_scripts else None
-        except:
+            scripts = pkg.get('scripts', {})
+            if scripts:
+                # Return important scripts
+                important_scripts = {}
+                for key in self.IMPORTANT_SCRIPTS:
+                    if key in scripts:
+                        important_scripts[key] = scripts[key]
+                return important_scripts if important_scripts else None
+        except (AttributeError, TypeError):
+            # Not an object, or scripts isn't one
             pass
 
         return None
@@ -955,15 +1326,18 @@ class CodeAnalyzer:
 
         # Phase 2: Extract call relationships for each file
         for file_path, meta in self.files.items():
-            content = self._file_contents.get(file_path, '')
-            if not content:
-                continue
-
             ext = meta.get('extension', '')
 
+            # Python calls were collected while parsing the AST
             if ext == '.py':
-                self._extract_python_calls(file_path, content, call_graph, func_registry, file_dependencies)
-            elif ext in {'.js', '.jsx', '.ts', '.tsx'}:
+                self._extract_python_calls(file_path, call_graph, func_registry, file_dependencies)
+                continue
+
+            content = self._file_contents.pop(file_path, '')
+            if not content:
+                continue
+
+            if ext in {'.js', '.jsx', '.ts', '.tsx'}:
                 self._extract_js_calls(file_path, content, call_graph, func_registry, file_dependencies)
             elif ext == '.java':
                 self._extract_java_calls(file_path, content, call_graph, func_registry, file_dependencies)
@@ -979,38 +1353,32 @@ class CodeAnalyzer:
 
         return call_graph
 
-    def _extract_python_calls(self, file_path: str, content: str,
+    def _extract_python_calls(self, file_path: str,
                                call_graph: Dict, func_registry: Dict,
                                file_dependencies: Dict):
-        """Use AST to extract function calls within each function body in Python."""
-        try:
-            tree = ast.parse(content)
-        except:
+        """Extract function calls within each function body in Python (collected during AST parsing)."""
+        function_calls = self._python_calls.get(file_path)
+        if not function_calls:
             return
 
         # Get resolved dependencies for this file
         resolved_deps = set(file_dependencies.get(file_path, {}).get('resolved', []))
 
-        # Walk to find all function definitions
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                caller_id = f"{file_path}::{node.name}"
-                if caller_id not in call_graph:
-                    continue
+        for func_name, callee_names in function_calls:
+            caller_id = f"{file_path}::{func_name}"
+            if caller_id not in call_graph:
+                continue
 
-                # Walk the function body looking for Call nodes
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Call):
-                        callee_name = self._extract_call_name(child)
-                        if callee_name and callee_name in func_registry:
-                            # Resolve to qualified IDs
-                            resolved = self._resolve_call(
-                                callee_name, file_path, func_registry, resolved_deps
-                            )
-                            for target_id in resolved:
-                                if target_id != caller_id:  # Skip self-recursion noise
-                                    if target_id not in call_graph[caller_id]['calls']:
-                                        call_graph[caller_id]['calls'].append(target_id)
+            for callee_name in callee_names:
+                if callee_name in func_registry:
+                    # Resolve to qualified IDs
+                    resolved = self._resolve_call(
+                        callee_name, file_path, func_registry, resolved_deps
+                    )
+                    for target_id in resolved:
+                        if target_id != caller_id:  # Skip self-recursion noise
+                            if target_id not in call_graph[caller_id]['calls']:
+                                call_graph[caller_id]['calls'].append(target_id)
 
     def _extract_call_name(self, call_node: ast.Call) -> Optional[str]:
         """Extract the function name from an ast.Call node."""
@@ -1028,13 +1396,7 @@ class CodeAnalyzer:
         resolved_deps = set(file_dependencies.get(file_path, {}).get('resolved', []))
 
         # Find function boundaries using regex
-        func_pattern = re.compile(
-            r'(?:function\s+(\w+)\s*\([^)]*\)\s*\{|'        # function foo() {
-            r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>|'  # const foo = () =>
-            r'(?:const|let|var)\s+(\w+)\s*=\s*function\s*\(|'  # const foo = function(
-            r'(\w+)\s*\([^)]*\)\s*\{)',                         # method() { in class
-            re.MULTILINE
-        )
+        func_pattern = self.JS_FUNCTION_BOUNDARY_PATTERN
 
         functions_in_file = []
 
@@ -1052,9 +1414,7 @@ class CodeAnalyzer:
                 if body_end > start_pos:
                     functions_in_file.append((func_name, content[start_pos:body_end]))
 
-        # Build a regex pattern for all known function names (for efficiency)
-        known_names = set(func_registry.keys())
-        if not known_names:
+        if not func_registry:
             return
 
         # For each function body, search for calls to known functions
@@ -1063,16 +1423,12 @@ class CodeAnalyzer:
             if caller_id not in call_graph:
                 continue
 
-            for known_name in known_names:
-                # Skip very short names to avoid false positives
-                if len(known_name) < 2:
-                    continue
-                if re.search(r'\b' + re.escape(known_name) + r'\s*\(', body):
-                    resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
-                    for target_id in resolved:
-                        if target_id != caller_id:
-                            if target_id not in call_graph[caller_id]['calls']:
-                                call_graph[caller_id]['calls'].append(target_id)
+            for known_name in self._find_calls(body, func_registry):
+                resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
+                for target_id in resolved:
+                    if target_id != caller_id:
+                        if target_id not in call_graph[caller_id]['calls']:
+                            call_graph[caller_id]['calls'].append(target_id)
 
     def _extract_java_calls(self, file_path: str, content: str,
                             call_graph: Dict, func_registry: Dict,
@@ -1081,10 +1437,7 @@ class CodeAnalyzer:
         resolved_deps = set(file_dependencies.get(file_path, {}).get('resolved', []))
 
         # Find method boundaries
-        method_pattern = re.compile(
-            r'(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\([^)]*\)\s*(?:throws\s+[\w,\s]+\s*)?\{',
-            re.MULTILINE
-        )
+        method_pattern = self.JAVA_METHOD_BOUNDARY_PATTERN
 
         methods_in_file = []
         for match in method_pattern.finditer(content):
@@ -1096,21 +1449,17 @@ class CodeAnalyzer:
                     if body_end > body_start:
                         methods_in_file.append((method_name, content[body_start:body_end]))
 
-        known_names = set(func_registry.keys())
         for method_name, body in methods_in_file:
             caller_id = f"{file_path}::{method_name}"
             if caller_id not in call_graph:
                 continue
 
-            for known_name in known_names:
-                if len(known_name) < 2:
-                    continue
-                if re.search(r'\b' + re.escape(known_name) + r'\s*\(', body):
-                    resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
-                    for target_id in resolved:
-                        if target_id != caller_id:
-                            if target_id not in call_graph[caller_id]['calls']:
-                                call_graph[caller_id]['calls'].append(target_id)
+            for known_name in self._find_calls(body, func_registry):
+                resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
+                for target_id in resolved:
+                    if target_id != caller_id:
+                        if target_id not in call_graph[caller_id]['calls']:
+                            call_graph[caller_id]['calls'].append(target_id)
 
     def _extract_go_calls(self, file_path: str, content: str,
                           call_graph: Dict, func_registry: Dict,
@@ -1119,7 +1468,7 @@ class CodeAnalyzer:
         resolved_deps = set(file_dependencies.get(file_path, {}).get('resolved', []))
 
         # Find function boundaries
-        func_pattern = re.compile(r'func\s+(?:\([^)]+\)\s+)?(\w+)\s*\([^)]*\)\s*(?:\([^)]*\)\s*)?\{', re.MULTILINE)
+        func_pattern = self.GO_FUNCTION_BOUNDARY_PATTERN
 
         funcs_in_file = []
         for match in func_pattern.finditer(content):
@@ -1131,21 +1480,29 @@ class CodeAnalyzer:
                     if body_end > body_start:
                         funcs_in_file.append((func_name, content[body_start:body_end]))
 
-        known_names = set(func_registry.keys())
         for func_name, body in funcs_in_file:
             caller_id = f"{file_path}::{func_name}"
             if caller_id not in call_graph:
                 continue
 
-            for known_name in known_names:
-                if len(known_name) < 2:
-                    continue
-                if re.search(r'\b' + re.escape(known_name) + r'\s*\(', body):
-                    resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
-                    for target_id in resolved:
-                        if target_id != caller_id:
-                            if target_id not in call_graph[caller_id]['calls']:
-                                call_graph[caller_id]['calls'].append(target_id)
+            for known_name in self._find_calls(body, func_registry):
+                resolved = self._resolve_call(known_name, file_path, func_registry, resolved_deps)
+                for target_id in resolved:
+                    if target_id != caller_id:
+                        if target_id not in call_graph[caller_id]['calls']:
+                            call_graph[caller_id]['calls'].append(target_id)
+
+    def _find_calls(self, body: str, func_registry: Dict) -> List[str]:
+        """
+        Known function names called in body (a name followed by '('), in
+        order of first call. Very short names are skipped to avoid false
+        positives.
+        """
+        called = []
+        for name in dict.fromkeys(self.CALL_PATTERN.findall(body)):
+            if len(name) >= 2 and name in func_registry:
+                called.append(name)
+        return called
 
     def _find_brace_end(self, content: str, start: int) -> int:
         """Find matching closing brace from a position."""
@@ -1221,3 +1578,93 @@ class CodeAnalyzer:
 
         # Fallback: return limited candidates to avoid explosion
         return candidates[:3]
+
+
+# Analysis is pure-Python AST/regex work, so it runs in worker processes
+# to use every core instead of contending for the GIL. Workers are spawned
+# rather than forked: the server already runs threads (clones, reads), and
+# a forked child can inherit a lock one of them held
+_analyzer_pool: Optional[ProcessPoolExecutor] = None
+_analyzer_pool_lock = threading.Lock()
+
+
+def get_analyzer_pool() -> ProcessPoolExecutor:
+    """Return the shared analyzer process pool, starting it on first use."""
+    global _analyzer_pool
+    with _analyzer_pool_lock:
+        if _analyzer_pool is None:
+            _analyzer_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _analyzer_pool
+
+
+# Source reads kept in flight ahead of parsing, and threads issuing them
+READ_AHEAD_DEPTH = 32
+READ_AHEAD_THREADS = 8
+
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    """Read a file's bytes, or None if it can't be read."""
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def read_ahead(paths: List[Path]) -> Iterator[Tuple[Path, Optional[bytes]]]:
+    """
+    Yield (path, contents or None if unreadable) in order, reading up to
+    READ_AHEAD_DEPTH files ahead on a few threads.
+
+    Reads release the GIL, so on a cold page cache the disk latency of
+    upcoming files overlaps parsing of the current one instead of each
+    read waiting its turn.
+    """
+    if len(paths) < 2:
+        for path in paths:
+            yield path, _read_bytes(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=READ_AHEAD_THREADS) as pool:
+        queue = iter(paths)
+        pending = deque((path, pool.submit(_read_bytes, path)) for path in islice(queue, READ_AHEAD_DEPTH))
+        while pending:
+            path, future = pending.popleft()
+            following = next(queue, None)
+            if following is not None:
+                pending.append((following, pool.submit(_read_bytes, following)))
+            yield path, future.result()
+
+
+def _parse_chunk(repo_path: str, paths: List[str]) -> List[tuple]:
+    """
+    Analyze a chunk of files in a worker process.
+
+    Returns (relative path, metadata, full content, Python call names) per
+    successfully analyzed file, in input order.
+    """
+    analyzer = CodeAnalyzer(repo_path)
+    results = []
+    for path, raw in read_ahead([Path(p) for p in paths]):
+        meta = analyzer._analyze_file(path, raw)
+        if meta:
+            rel = str(path.relative_to(analyzer.repo_path))
+            results.append((
+                rel,
+                meta,
+                analyzer._file_contents.pop(rel, ''),
+                analyzer._python_calls.pop(rel, None),
+            ))
+    return results
+
+
+def analyze_path(repo_path: str) -> Dict[str, Any]:
+    """
+    Analyze a repository path. Top-level so it can run in the process pool.
+
+    Parses serially: the shared pool already spreads analyses across cores,
+    and a second pool per worker would fork cpu_count squared processes.
+    """
+    return CodeAnalyzer(repo_path, parallel=False).analyze()
@@ -0,0 +1,317 @@
+"""
+Relevance Ranking Service
+
+Okapi BM25 over per-file "documents" built from a file's path, function
+names and class names, plus an Aho-Corasick matcher for file names the
+question mentions outright, and intent-weighted importance scores for
+the remaining files. Used to pick which files' source code is worth
+sending to the LLM for a given question.
+"""
+
+import math
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.services.semantic_search import split_identifier
+
+# Words that carry no signal about which file a question is about
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does',
+    'for', 'from', 'how', 'in', 'is', 'it', 'me', 'of', 'on', 'or', 'the',
+    'this', 'to', 'what', 'when', 'where', 'which', 'who', 'why', 'with',
+    'work', 'works', 'you', 'explain', 'show', 'tell', 'code', 'file',
+})
+
+WORD_PATTERN = re.compile(r'[A-Za-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase identifier words, dropping stopwords."""
+    tokens = []
+    for word in WORD_PATTERN.findall(text):
+        tokens.extend(t for t in split_identifier(word) if t not in STOPWORDS)
+    return tokens
+
+
+def file_document(path: str, info: dict) -> List[str]:
+    """Token list describing a file: its path, functions and classes."""
+    # The extension says nothing about what a file does
+    stem, dot, ext = path.rpartition('.')
+    parts = [stem if dot and '/' not in ext else path]
+    parts.extend(info.get('functions', []))
+    parts.extend(info.get('classes', []))
+    return tokenize(' '.join(parts))
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over a fixed set of documents.
+    """
+
+    def __init__(self, documents: Dict[str, List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_freqs: Dict[str, Counter] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.df: Counter = Counter()
+
+        for key, tokens in documents.items():
+            freqs = Counter(tokens)
+            self.doc_freqs[key] = freqs
+            self.doc_lengths[key] = len(tokens)
+            self.df.update(freqs.keys())
+
+        n_docs = len(documents)
+        self.avg_length = (sum(self.doc_lengths.values()) / n_docs) if n_docs else 0.0
+        # Non-negative IDF so terms common to most files never count against a match
+        self.idf = {
+            term: math.log(1 + (n_docs - n + 0.5) / (n + 0.5))
+            for term, n in self.df.items()
+        }
+
+    def scores(self, query_tokens: List[str]) -> Dict[str, float]:
+        """Score every document containing at least one query term."""
+        terms = [t for t in set(query_tokens) if t in self.idf]
+        results: Dict[str, float] = {}
+        if not terms or not self.avg_length:
+            return results
+
+        k1 = self.k1
+        for key, freqs in self.doc_freqs.items():
+            norm = k1 * (1 - self.b + self.b * self.doc_lengths[key] / self.avg_length)
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (k1 + 1) / (tf + norm)
+            if score > 0:
+                results[key] = score
+
+        return results
+
+    def top_n(self, query_tokens: List[str], n: int) -> List[str]:
+        """Keys of the n highest-scoring documents, best first."""
+        ranked = sorted(self.scores(query_tokens).items(), key=lambda x: x[1], reverse=True)
+        return [key for key, _ in ranked[:n]]
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton: finds which of a fixed set of keywords occur
+    in a text in one pass over the text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._link()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(keyword)
+
+    def _link(self):
+        """Compute failure links breadth-first, merging outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords occurring anywhere in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class MentionMatcher:
+    """
+    Finds files a question mentions by name, stem, or any path segment.
+    """
+
+    def __init__(self, file_paths: Iterable[str]):
+        self.paths: List[str] = []
+        self._keyword_files: Dict[str, List[int]] = {}
+        # Files with an empty name part match any question (as a substring test would)
+        self._always: List[int] = []
+
+        for i, file_path in enumerate(file_paths):
+            self.paths.append(file_path)
+            file_name = file_path.split('/')[-1].lower()
+            file_stem = file_name.rsplit('.', 1)[0] if '.' in file_name else file_name
+            keywords = {file_name, file_stem}
+            keywords.update(part.lower() for part in file_path.split('/'))
+
+            if '' in keywords:
+                self._always.append(i)
+            for keyword in keywords:
+                if keyword:
+                    self._keyword_files.setdefault(keyword, []).append(i)
+
+        self._automaton = KeywordAutomaton(self._keyword_files)
+
+    def find(self, question: str) -> List[str]:
+        """Paths mentioned in question, in the order they were given."""
+        matched = set(self._always)
+        for keyword in self._automaton.find(question.lower()):
+            matched.update(self._keyword_files[keyword])
+        return [self.paths[i] for i in sorted(matched)]
+
+
+def select_window(content: str, budget_chars: int, query_tokens: Iterable[str]) -> Optional[str]:
+    """
+    Pick the contiguous run of lines that best matches the query and fits
+    in budget_chars, marking elided lines before and after it.
+
+    Lines are scored by how many query terms they contain, smoothed with
+    their neighbours so a window lands on a relevant block rather than a
+    lone line. Returns None if no line matches, so the caller can fall back
+    to a plain head cut.
+    """
+    query = set(query_tokens)
+    lines = content.splitlines()
+    if not query or not lines:
+        return None
+
+    raw = [len(query.intersection(tokenize(line))) for line in lines]
+    if not any(raw):
+        return None
+
+    n = len(lines)
+    scores = [
+        raw[i] + 0.5 * (raw[i - 1] if i > 0 else 0) + 0.5 * (raw[i + 1] if i + 1 < n else 0)
+        for i in range(n)
+    ]
+    costs = [len(line) + 1 for line in lines]
+
+    # Two-pointer sweep for the highest-scoring windows within budget
+    best_score, best_windows = 0.0, []
+    window_score, window_cost, start = 0.0, 0, 0
+    for end in range(n):
+        window_score += scores[end]
+        window_cost += costs[end]
+        while window_cost > budget_chars and start <= end:
+            window_score -= scores[start]
+            window_cost -= costs[start]
+            start += 1
+        if start > end or window_score < best_score:
+            continue
+        if window_score > best_score:
+            best_score, best_windows = window_score, []
+        best_windows.append((start, end + 1))
+
+    if not best_windows:
+        return None
+
+    # Equally good windows slide across the same matches; the middle one
+    # centres them with context on both sides
+    best_start, best_end = best_windows[len(best_windows) // 2]
+
+    parts = []
+    if best_start > 0:
+        parts.append(f"... [{best_start} lines elided] ...")
+    parts.extend(lines[best_start:best_end])
+    if best_end < n:
+        parts.append(f"... [{n - best_end} lines elided] ...")
+    return "\n".join(parts)
+
+
+# Question intents, checked in order; the first whose pattern matches wins
+INTENT_PATTERNS = [
+    ('debug', re.compile(r'\b(?:bug|error|errors|fix|crash\w*|exception|fail\w*|traceback|broken|issue|wrong|debug\w*)\b')),
+    ('test', re.compile(r'\b(?:tests?|testing|spec|specs|coverage|mock\w*|pytest|jest|unittest)\b')),
+    ('refactor', re.compile(r'\b(?:refactor\w*|clean\w*|simplif\w*|restructur\w*|rename|improve|optimi[sz]\w*|duplicat\w*)\b')),
+    ('review', re.compile(r'\b(?:review|security|secure|vulnerab\w*|best practices?|smells?|quality|audit)\b')),
+    ('integration', re.compile(r'\b(?:integrat\w*|api|apis|endpoints?|connect\w*|webhooks?|sdk|database|third[- ]party|requests?)\b')),
+    ('navigate', re.compile(r'\b(?:where|find|locate|which file|entry ?points?|start\w*|main)\b')),
+]
+DEFAULT_INTENT = 'explain'
+
+# Per-intent weights for file signals; 'explain' keeps the original
+# functions + 2 * classes importance score
+INTENT_WEIGHTS = {
+    'explain': {'functions': 1.0, 'classes': 2.0},
+    'debug': {'functions': 1.0, 'classes': 1.0, 'error_handling': 2.0},
+    'test': {'functions': 1.0, 'classes': 1.0, 'test_file': 10.0},
+    'refactor': {'functions': 1.5, 'classes': 2.0, 'lines': 0.01},
+    'review': {'functions': 1.0, 'classes': 2.0, 'lines': 0.005, 'error_handling': 1.0},
+    'integration': {'functions': 1.0, 'classes': 1.0, 'imports': 0.5},
+    'navigate': {'functions': 1.0, 'classes': 2.0, 'has_main': 5.0},
+}
+
+# Score multipliers (1 + penalty) for paths that rarely hold the answer
+PATH_PENALTIES = {
+    'test': -0.5,
+    'dist': -0.4,
+    'node_modules': -0.9,
+    'docs': -0.3,
+}
+
+ERROR_HANDLING_PATTERN = re.compile(r'\b(?:except|catch|raise|throw|panic|Error|Exception)\b')
+
+
+def detect_intent(question: str) -> str:
+    """Classify what kind of answer a question is after."""
+    question_lower = question.lower()
+    for intent, pattern in INTENT_PATTERNS:
+        if pattern.search(question_lower):
+            return intent
+    return DEFAULT_INTENT
+
+
+def file_importance(path: str, info: dict, intent: str = DEFAULT_INTENT) -> float:
+    """Weighted importance of a file for a question of the given intent."""
+    weights = INTENT_WEIGHTS.get(intent, INTENT_WEIGHTS[DEFAULT_INTENT])
+    path_lower = path.lower()
+    is_test = 'test' in path_lower or 'spec' in path_lower
+
+    score = (weights['functions'] * len(info.get('functions', []))
+             + weights['classes'] * len(info.get('classes', [])))
+    if 'lines' in weights:
+        score += weights['lines'] * info.get('lines', 0)
+    if 'imports' in weights:
+        score += weights['imports'] * len(info.get('imports', []))
+    if 'has_main' in weights and info.get('has_main'):
+        score += weights['has_main']
+    if 'error_handling' in weights:
+        matches = len(ERROR_HANDLING_PATTERN.findall(info.get('content', '')))
+        score += weights['error_handling'] * min(matches, 10)
+    if 'test_file' in weights and is_test:
+        score += weights['test_file']
+
+    for fragment, penalty in PATH_PENALTIES.items():
+        # Test files are what a testing question is about
+        if fragment == 'test' and intent == 'test':
+            continue
+        if fragment in path_lower:
+            score *= 1 + penalty
+
+    return score
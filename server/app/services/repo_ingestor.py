@@ -1,13 +1,22 @@
 import os
 import re
 import uuid
+import queue
 import shutil
+import threading
 from git import Repo, GitCommandError
 from fastapi import HTTPException
 
 BASE_DIR = "workspace"
 
-def clone_repo(repo_url: str) -> str:
+# Cloned repos are moved here and deleted by a background thread
+TRASH_DIR = os.path.join(BASE_DIR, ".trash")
+
+_cleanup_queue: "queue.Queue[str]" = queue.Queue()
+_cleanup_thread = None
+_cleanup_lock = threading.Lock()
+
+def clone_repo(repo_url: str, shallow: bool = True) -> str:
     # Trim whitespace
     repo_url = repo_url.strip()
 
@@ -38,8 +47,17 @@ def clone_repo(repo_url: str) -> str:
     repo_id = str(uuid.uuid4())
     repo_path = os.path.join(BASE_DIR, repo_id)
 
+    # Shallow, blob-filtered clone: only the working tree at HEAD is analyzed,
+    # so history and unreferenced blobs are never downloaded
+    clone_options = {"depth": 1, "single_branch": True, "filter": "blob:none"} if shallow else {}
+
     try:
-        Repo.clone_from(repo_url, repo_path, depth=1)
+        Repo.clone_from(
+            repo_url,
+            repo_path,
+            env={"GIT_TERMINAL_PROMPT": "0"},  # Fail fast instead of prompting for credentials
+            **clone_options
+        )
     except GitCommandError as e:
         # Cleanup partial clone
         if os.path.exists(repo_path):
@@ -65,3 +83,36 @@ def clone_repo(repo_url: str) -> str:
             )
 
     return repo_path
+
+def get_commit_sha(repo_path: str) -> str:
+    """Return the HEAD commit SHA of a cloned repository."""
+    return Repo(repo_path).head.commit.hexsha
+
+def _cleanup_worker():
+    while True:
+        path = _cleanup_queue.get()
+        shutil.rmtree(path, ignore_errors=True)
+        _cleanup_queue.task_done()
+
+def schedule_cleanup(repo_path: str):
+    """
+    Remove a cloned repository without waiting for the deletion.
+
+    The clone is renamed out of the workspace immediately and deleted
+    by a background thread.
+    """
+    global _cleanup_thread
+
+    os.makedirs(TRASH_DIR, exist_ok=True)
+    trash_path = os.path.join(TRASH_DIR, os.path.basename(repo_path))
+    try:
+        os.rename(repo_path, trash_path)
+    except OSError:
+        trash_path = repo_path
+
+    with _cleanup_lock:
+        if _cleanup_thread is None:
+            _cleanup_thread = threading.Thread(target=_cleanup_worker, name="repo-cleanup", daemon=True)
+            _cleanup_thread.start()
+
+    _cleanup_queue.put(trash_path)
@@ -1,4 +1,5 @@
 import os
+from typing import Iterable, Iterator
 
 IGNORE_DIRS = {
     ".git",
@@ -10,6 +11,39 @@ IGNORE_DIRS = {
     "venv"
 }
 
+def iter_files(root: str, skip_dirs: Iterable[str] = ()) -> Iterator[os.DirEntry]:
+    """
+    Yield a DirEntry for every file under root, in os.walk order.
+
+    Uses os.scandir directly so entries carry their cached type information
+    and no path objects are built for files the caller filters out.
+    Symlinked directories are not followed, matching os.walk's default.
+    """
+    skip = set(skip_dirs)
+    stack = [os.fspath(root)]
+
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        subdirs = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in skip and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    yield entry
+
+        # Reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
 def scan_repo(repo_path: str):
     file_count = 0
     folders = set()
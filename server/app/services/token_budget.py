@@ -0,0 +1,170 @@
+"""
+Token Budget Service
+
+Counts prompt tokens with tiktoken so chat context can be packed against
+the model's real token limit instead of a characters-per-token guess.
+Falls back to a ~4 characters per token estimate when tiktoken (or its
+encoding data) is unavailable. Counts for large texts are also kept in a
+small sqlite store keyed by content hash, so file contents tokenized by an
+earlier server process aren't re-encoded.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from app.services.analysis_cache import AnalysisCache
+
+# Fallback estimate when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Token budget for a chat request, split as in the Groq free tier (12k TPM):
+# total - system prompt instructions - chat history - reserved completion
+MODEL_TOKEN_LIMIT = 12000
+SYSTEM_PROMPT_TOKENS = 500
+HISTORY_TOKENS = 1500
+COMPLETION_TOKENS = 2048
+MAX_CONTEXT_TOKENS = MODEL_TOKEN_LIMIT - SYSTEM_PROMPT_TOKENS - HISTORY_TOKENS - COMPLETION_TOKENS
+
+# Per-message framing tokens (role, separators) in the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Persistent token-count store; texts shorter than TOKEN_CACHE_MIN_CHARS
+# encode faster than a lookup
+TOKEN_CACHE_PATH = os.getenv(
+    "TOKEN_CACHE_PATH", os.path.join(tempfile.gettempdir(), "codeexplorer-tokcache.sqlite")
+)
+TOKEN_CACHE_MIN_CHARS = 2048
+
+# In-process token counts, keyed by content digest so the cache holds
+# 16-byte keys rather than a reference to every text it has counted
+token_count_cache = AnalysisCache(maxsize=4096)
+
+
+class TokenCountStore:
+    """
+    sqlite-backed map of content digest -> token count, shared across
+    restarts. Any database error disables the store rather than failing
+    a chat.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disabled:
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                # Under WAL, NORMAL stays corruption-safe without an fsync per commit
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS token_counts "
+                    "(digest BLOB PRIMARY KEY, tokens INTEGER NOT NULL)"
+                )
+                self._conn = conn
+            except sqlite3.Error:
+                self._disabled = True
+        return self._conn
+
+    def get(self, digest: bytes) -> Optional[int]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT tokens FROM token_counts WHERE digest = ?", (digest,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            return row[0] if row else None
+
+    def set(self, digest: bytes, tokens: int):
+        self.set_many([(digest, tokens)])
+
+    def set_many(self, items: Iterable[Tuple[bytes, int]]):
+        """Store several (digest, tokens) pairs in one transaction."""
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO token_counts (digest, tokens) VALUES (?, ?)",
+                    items,
+                )
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+
+token_count_store = TokenCountStore(TOKEN_CACHE_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    """Load the cl100k_base encoding once, or None if tiktoken isn't usable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def text_digest(text: str) -> bytes:
+    """Content hash of text, the key for cached token counts."""
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+
+def count_tokens(text: str, pending: Optional[List[Tuple[bytes, int]]] = None) -> int:
+    """
+    Number of tokens in text (cached, since file blocks repeat across chats).
+
+    New counts for large texts are written to the persistent store, or
+    appended to pending for the caller to store in one batch.
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    # Content-addressed, so edited files simply miss
+    digest = text_digest(text)
+    tokens = token_count_cache.get(digest)
+    if tokens is not None:
+        return tokens
+
+    persist = len(text) >= TOKEN_CACHE_MIN_CHARS
+    if persist:
+        tokens = token_count_store.get(digest)
+    if tokens is None:
+        tokens = len(encoding.encode(text, disallowed_special=()))
+        if persist:
+            if pending is None:
+                token_count_store.set(digest, tokens)
+            else:
+                pending.append((digest, tokens))
+    token_count_cache.set(digest, tokens)
+    return tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens."""
+    encoding = get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
@@ -0,0 +1,96 @@
+import pytest
+
+from app.services import analysis_cache
+from app.services.analysis_cache import (
+    AnalysisCache, analysis_fingerprint, remember_analysis, trusted_analysis,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the cache module; advance with clock[0] += seconds."""
+    now = [1000.0]
+    monkeypatch.setattr(analysis_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_value():
+    cache = AnalysisCache(maxsize=2)
+    cache.set("a", {"files": 1})
+    assert cache.get("a") == {"files": 1}
+    assert cache.get("missing") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = AnalysisCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    clock[0] += 60
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+
+
+def test_per_entry_expire_overrides_ttl(clock):
+    cache = AnalysisCache(maxsize=4, ttl=60)
+    cache.set("short", 1, expire=5)
+    cache.set("default", 2)
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("default") == 2
+
+
+def test_evicts_least_recently_used():
+    cache = AnalysisCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now more recent than b
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_overwriting_a_key_refreshes_it():
+    cache = AnalysisCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_clear_drops_everything():
+    cache = AnalysisCache(maxsize=2)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_issued_fingerprint_uses_the_held_analysis():
+    structure = {"files": {"main.py": {"content": "print('hi')"}}}
+    fingerprint = analysis_fingerprint(structure)
+    remember_analysis(fingerprint, "https://github.com/org/repo", structure)
+
+    forged = {"repository_url": "https://evil.example", "structure_analysis": {"files": {}}}
+    analysis = trusted_analysis(forged, fingerprint)
+
+    assert analysis == {
+        "repository_url": "https://github.com/org/repo",
+        "structure_analysis": structure,
+        "fingerprint": fingerprint,
+    }
+    # A fingerprint carried inside analysis_data is checked the same way
+    assert trusted_analysis(dict(forged, fingerprint=fingerprint)) == analysis
+
+
+def test_unknown_fingerprint_is_recomputed_from_the_payload():
+    structure = {"files": {"planted.py": {}}}
+    claimed = analysis_fingerprint(structure)  # never issued by the server
+    analysis_data = {"repository_url": "https://github.com/org/other", "structure_analysis": structure}
+
+    analysis = trusted_analysis(analysis_data, claimed)
+
+    assert analysis["structure_analysis"] is structure
+    assert analysis["fingerprint"] != claimed
+    assert analysis["fingerprint"] == trusted_analysis(dict(analysis_data, fingerprint="made-up"))["fingerprint"]
@@ -0,0 +1,22 @@
+from app.services import code_analyzer
+from app.services.code_analyzer import CodeAnalyzer, analyze_path
+
+
+def make_repo(tmp_path, count):
+    for i in range(count):
+        (tmp_path / f"mod{i}.py").write_text(f"def func{i}():\n    return {i}\n")
+    return tmp_path
+
+
+def test_analyze_path_parses_serially(tmp_path, monkeypatch):
+    # analyze_path runs inside the shared analyzer pool; it must not start another
+    def no_pool(*args, **kwargs):
+        raise AssertionError("analyze_path started a nested process pool")
+
+    monkeypatch.setattr(code_analyzer, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(code_analyzer.os, "cpu_count", lambda: 4)
+    repo = make_repo(tmp_path, CodeAnalyzer.PARALLEL_MIN_FILES)
+
+    result = analyze_path(str(repo))
+
+    assert len(result["files"]) == CodeAnalyzer.PARALLEL_MIN_FILES
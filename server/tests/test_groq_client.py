@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.services import chat_service
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "llama-3.3-70b-versatile",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "ok"},
+    }],
+}
+
+
+@pytest.fixture
+def groq_requests(monkeypatch):
+    """Route the shared Groq client through a mock transport; yields the sent requests."""
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json=COMPLETION)
+
+    class MockAsyncClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(httpx, "AsyncClient", MockAsyncClient)
+    chat_service.get_groq_client.cache_clear()
+    yield sent
+    chat_service.get_groq_client.cache_clear()
+
+
+def test_request_body_is_serialized_with_orjson(groq_requests, monkeypatch):
+    serialized = []
+    dumps = orjson.dumps
+
+    def spy(obj, *args, **kwargs):
+        serialized.append(obj)
+        return dumps(obj, *args, **kwargs)
+
+    monkeypatch.setattr(orjson, "dumps", spy)
+    messages = [{"role": "user", "content": "What does main.py do? é"}]
+
+    client = chat_service.get_groq_client()
+    response = asyncio.run(client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=messages,
+        temperature=0.7,
+    ))
+
+    assert response.choices[0].message.content == "ok"
+    [request] = groq_requests
+    body = orjson.loads(request.content)
+    assert body["messages"] == messages
+    assert body["temperature"] == 0.7
+    assert body in serialized
@@ -0,0 +1,114 @@
+import pytest
+
+from app.services.code_analyzer import CodeAnalyzer, ImportMap
+
+# Expected values below were produced by the original dict-based file map
+# and _resolve_import, so these tests pin the rewrite to the old behaviour
+
+MAP_FILES = [
+    'index.ts', 'src/app.tsx', 'src/components/Button.tsx', 'src/components/index.ts',
+    'src/utils/format.js', 'lib/index.ts', 'lib/utils.ts', 'app/__init__.py', 'app/models.py',
+    'pkg/server.go', 'Button.jsx',
+]
+
+RESOLVED_NAMES = [
+    ('Button', 'Button.jsx'),
+    ('components/Button', 'src/components/Button.tsx'),
+    ('src/components', 'src/components/index.ts'),
+    ('components', 'src/components/index.ts'),
+    ('@/components/Button', 'src/components/Button.tsx'),
+    ('@/components', 'src/components/index.ts'),
+    ('@/utils/format.js', 'src/utils/format.js'),
+    ('./Button', 'Button.jsx'),
+    ('./components', 'src/components/index.ts'),
+    ('/src/app', 'src/app.tsx'),
+    ('/lib', 'lib/index.ts'),
+    ('/utils', None),
+    ('app', 'app/__init__.py'),
+    ('app/models', 'app/models.py'),
+    ('models.py', 'app/models.py'),
+    ('server', 'pkg/server.go'),
+    ('pkg/server', 'pkg/server.go'),
+    ('index', 'lib/index.ts'),
+    ('.', 'lib/index.ts'),
+    ('./.', None),
+    ('/.', None),
+    ('lib/index', 'lib/index.ts'),
+    ('utils/format', 'src/utils/format.js'),
+    ('missing', None),
+    ('./missing', None),
+    ('/Button', 'Button.jsx'),
+]
+
+FILE_IMPORTS = {
+    'index.ts': ['./src/app', './lib', 'react'],
+    'src/app.tsx': ['./components/Button', '../lib/utils', '@/hooks/useAuth', 'react-dom', '@types/node'],
+    'src/components/Button.tsx': ['./Icon', '../styles', 'clsx', '.'],
+    'src/components/Icon.tsx': ['react', '..'],
+    'src/components/index.ts': ['./Button', './Icon'],
+    'src/hooks/useAuth.ts': ['../../lib/utils', '../api/client', '../../../../config'],
+    'src/api/client.js': ['axios', '/lib/utils', '/src/styles'],
+    'src/styles/index.js': ['../components'],
+    'lib/utils.ts': ['./index', '..\\src\\app', 'lodash'],
+    'lib/index.ts': ['./utils', '.'],
+    'config.py': ['os', 'app.models', 'lib'],
+    'app/__init__.py': ['app.models', 'models'],
+    'app/models.py': ['app', 'config', 'utils', '__init__'],
+    'cmd/main.go': ['fmt', 'github.com/org/repo/pkg', 'pkg/server'],
+    'pkg/server/server.go': ['net/http'],
+    'src/main/java/com/Example.java': ['com.Example', 'Example'],
+}
+
+# (resolved, external) per file
+FILE_DEPENDENCIES = {
+    'index.ts': (['src/app.tsx', 'lib/index.ts'], ['react']),
+    'src/app.tsx': (['src/components/Button.tsx', 'lib/utils.ts'], ['@/hooks/useAuth', 'react-dom', '@types/node']),
+    'src/components/Button.tsx': (['src/components/Icon.tsx', 'src/styles/index.js', 'lib/index.ts'], ['clsx']),
+    'src/components/Icon.tsx': ([], ['react', '..']),
+    'src/components/index.ts': (['src/components/Button.tsx', 'src/components/Icon.tsx'], []),
+    'src/hooks/useAuth.ts': (['lib/utils.ts', 'src/api/client.js', 'config.py'], []),
+    'src/api/client.js': (['lib/utils.ts', 'src/styles/index.js'], ['axios']),
+    'src/styles/index.js': (['src/components/index.ts'], []),
+    'lib/utils.ts': (['lib/index.ts', 'src/app.tsx'], ['lodash']),
+    'lib/index.ts': (['lib/utils.ts', 'lib/index.ts'], []),
+    'config.py': (['lib/index.ts'], ['os', 'app.models']),
+    'app/__init__.py': (['app/models.py'], ['app.models']),
+    'app/models.py': (['app/__init__.py', 'config.py', 'lib/utils.ts'], []),
+    'cmd/main.go': ([], ['fmt', 'github.com/org/repo/pkg', 'pkg/server']),
+    'pkg/server/server.go': ([], ['net/http']),
+    'src/main/java/com/Example.java': (['src/main/java/com/Example.java'], ['com.Example']),
+}
+
+
+def resolve_import(files, imp, current_file):
+    analyzer = CodeAnalyzer('.')
+    return analyzer._resolve_import(imp, current_file, ImportMap(files))
+
+
+def test_resolve_dot_probes_index_files():
+    file_map = ImportMap(['index.ts', 'src/app.ts'])
+    assert file_map.resolve('.') == 'index.ts'
+
+
+def test_imports_cleaned_to_dot_resolve_to_root_index():
+    files = ['index.ts', 'app.ts']
+    assert resolve_import(files, '/.', 'app.ts') == 'index.ts'
+    assert resolve_import(files, './.', 'app.ts') == 'index.ts'
+    assert resolve_import(files, '../.', 'app.ts') == 'index.ts'
+
+
+@pytest.mark.parametrize("name, expected", RESOLVED_NAMES)
+def test_resolve_matches_original_file_map(name, expected):
+    assert ImportMap(MAP_FILES).resolve(name) == expected
+
+
+def test_build_file_dependencies_matches_original():
+    analyzer = CodeAnalyzer('.')
+    for path, imports in FILE_IMPORTS.items():
+        analyzer.files[path] = {'imports': imports}
+
+    file_deps = analyzer._build_file_dependencies()
+
+    assert list(file_deps) == list(FILE_IMPORTS)
+    for path, (resolved, external) in FILE_DEPENDENCIES.items():
+        assert file_deps[path] == {'imports': FILE_IMPORTS[path], 'resolved': resolved, 'external': external}
@@ -0,0 +1,54 @@
+import re
+
+from app.services.relevance import select_window, tokenize
+
+ELIDED = re.compile(r'^\.\.\. \[(\d+) lines elided\] \.\.\.$')
+
+
+def numbered_lines(count, overrides):
+    lines = [f"line {i} filler text" for i in range(count)]
+    for i, line in overrides.items():
+        lines[i] = line
+    return lines
+
+
+def split_window(window):
+    """(lines elided before, kept lines, lines elided after) of a select_window result."""
+    lines = window.split("\n")
+    before = after = 0
+    if ELIDED.match(lines[0]):
+        before = int(ELIDED.match(lines.pop(0)).group(1))
+    if ELIDED.match(lines[-1]):
+        after = int(ELIDED.match(lines.pop()).group(1))
+    return before, lines, after
+
+
+def test_window_centres_on_matching_lines_within_budget():
+    lines = numbered_lines(40, {20: "def parse_config(path):", 21: "    return load_config(path)"})
+    budget = 120
+
+    window = select_window("\n".join(lines), budget, tokenize("how does parse config work"))
+
+    before, kept, after = split_window(window)
+    assert "def parse_config(path):" in kept
+    assert "    return load_config(path)" in kept
+    assert before > 0 and after > 0
+    assert kept == lines[before:len(lines) - after]
+    assert sum(len(line) + 1 for line in kept) <= budget
+
+
+def test_window_at_the_top_has_no_leading_marker():
+    lines = numbered_lines(30, {0: "import config", 1: "config.load()"})
+
+    before, kept, after = split_window(select_window("\n".join(lines), 80, ["config"]))
+
+    assert before == 0
+    assert kept[:2] == lines[:2]
+    assert after == len(lines) - len(kept)
+
+
+def test_no_window_without_matches():
+    content = "\n".join(numbered_lines(10, {}))
+    assert select_window(content, 50, ["config"]) is None
+    assert select_window(content, 50, []) is None
+    assert select_window("", 50, ["config"]) is None